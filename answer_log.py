@@ -0,0 +1,224 @@
+import argparse
+import os
+import struct
+import threading
+import time
+from array import array
+
+# Append-only Protokoll aller Antworten (Clip, Auswahl, Wahrheit, Modell, Antwortzeit, Nutzer).
+#
+# Antworten sind Datensätze fester Größe in <name>.bin, Clip- und Nutzernamen stehen einmalig in
+# <name>.names ("C<TAB>Clip" bzw. "U<TAB>Nutzer"; die ID ist die laufende Nummer je Art). Namen
+# werden immer vor den Datensätzen geschrieben, die sie benutzen; ein abgeschnittener letzter
+# Datensatz nach einem Absturz wird beim Lesen ignoriert.
+#
+# Auswertung z.B.: python answer_log.py Daten/Antworten
+
+EMOTIONS = ["Neutral", "Freude", "Trauer", "Wut", "Angst", "Ekel", "Überraschung"]
+EMOTION_CODES = {emotion: code for code, emotion in enumerate(EMOTIONS)}
+UNKNOWN = 255
+
+# Zeitpunkt, Clip-ID, Nutzer-ID, Antwortzeit (s), Auswahl, Wahrheit, Modell, Füllbyte
+RECORD = struct.Struct("<dIIfBBBx")
+
+
+def emotion_code(label):
+    return EMOTION_CODES.get(label, UNKNOWN)
+
+
+class AnswerStats:
+    """Laufende Aggregate in Arrays fester Breite, O(1) pro Antwort.
+
+    Pro Clip: Anzahl Antworten, richtige Antworten der Besucher, richtige Antworten des Modells
+    und Summe der Antwortzeiten. Dazu eine 7x7-Verwechslungsmatrix der Besucher (Zeile Wahrheit,
+    Spalte Auswahl).
+    """
+
+    def __init__(self):
+        self.shown = array("I")
+        self.human_correct = array("I")
+        self.model_correct = array("I")
+        self.response_sum = array("d")
+        self.confusion = array("I", [0] * (len(EMOTIONS) * len(EMOTIONS)))
+        self.total = 0
+
+    def ensure(self, clip_id):
+        while len(self.shown) <= clip_id:
+            self.shown.append(0)
+            self.human_correct.append(0)
+            self.model_correct.append(0)
+            self.response_sum.append(0.0)
+
+    def add(self, clip_id, selection, truth, model, response):
+        self.ensure(clip_id)
+        self.shown[clip_id] += 1
+        self.human_correct[clip_id] += selection == truth
+        self.model_correct[clip_id] += model == truth
+        self.response_sum[clip_id] += response
+        if selection < len(EMOTIONS) and truth < len(EMOTIONS):
+            self.confusion[truth * len(EMOTIONS) + selection] += 1
+        self.total += 1
+
+    def clip_accuracy(self, clip_id):
+        """(Besucher-Quote, Modell-Quote, mittlere Antwortzeit) eines Clips oder None."""
+        if clip_id >= len(self.shown) or not self.shown[clip_id]:
+            return None
+        shown = self.shown[clip_id]
+        return self.human_correct[clip_id] / shown, self.model_correct[clip_id] / shown, self.response_sum[clip_id] / shown
+
+    def confusion_row(self, truth):
+        start = truth * len(EMOTIONS)
+        return list(self.confusion[start:start + len(EMOTIONS)])
+
+
+def read_names(names_path):
+    """Liest die Namenstabelle: (Clipnamen, Nutzernamen), Index = ID."""
+    clips, users = [], []
+    if os.path.exists(names_path):
+        with open(names_path, "r", encoding="utf-8") as f:
+            for line in f:
+                kind, _, name = line.rstrip("\n").partition("\t")
+                (clips if kind == "C" else users).append(name)
+    return clips, users
+
+
+def iter_chunks(path, chunk_records=65536):
+    """Liest die Datensätze in Blöcken von chunk_records, ohne die Datei ganz zu laden.
+
+    Liefert Listen von Tupeln (Zeitpunkt, Clip-ID, Nutzer-ID, Antwortzeit, Auswahl, Wahrheit, Modell).
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk_records * RECORD.size)
+            usable = len(data) - len(data) % RECORD.size
+            if usable:
+                yield list(RECORD.iter_unpack(data[:usable]))
+            if len(data) < chunk_records * RECORD.size:
+                return
+
+
+class AnswerLog:
+    """Gepuffertes Schreiben von Antworten plus laufende Aggregate.
+
+    record() läuft im Tk-Thread und hängt nur an einen Puffer an; flush() schreibt den Puffer
+    (auch aus einem Worker-Thread) ans Dateiende. Beim Öffnen werden Namen und Aggregate aus
+    dem vorhandenen Protokoll blockweise wiederhergestellt.
+    """
+
+    def __init__(self, base_path, buffer_records=256):
+        self.path = base_path + ".bin"
+        self.names_path = base_path + ".names"
+        self.buffer_records = buffer_records
+        self.lock = threading.Lock()
+        # Hält ein flush() vom Tauschen der Puffer bis zum letzten Anhängen, damit sich die
+        # Namenszeilen zweier Flushes nicht mischen (die ID ist die Zeilennummer)
+        self.write_lock = threading.Lock()
+        self.stats = AnswerStats()
+        self.clip_ids = {}
+        self.user_ids = {}
+        self.clip_names = []
+        self.user_names = []
+        self.pending_names = []
+        self.pending = bytearray()
+        self.pending_count = 0
+
+    def load(self):
+        """Stellt Namenstabelle und Aggregate aus dem vorhandenen Protokoll wieder her."""
+        self.clip_names, self.user_names = read_names(self.names_path)
+        self.clip_ids = {name: i for i, name in enumerate(self.clip_names)}
+        self.user_ids = {name: i for i, name in enumerate(self.user_names)}
+        self.truncate_partial_record()
+        for chunk in iter_chunks(self.path):
+            for _, clip_id, _, response, selection, truth, model in chunk:
+                self.stats.add(clip_id, selection, truth, model, response)
+        return self
+
+    def truncate_partial_record(self):
+        """Schneidet einen beim Absturz nur teilweise geschriebenen Datensatz ab."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size % RECORD.size:
+            with open(self.path, "r+b") as f:
+                f.truncate(size - size % RECORD.size)
+
+    def intern(self, ids, names, kind, name):
+        entry = ids.get(name)
+        if entry is None:
+            entry = ids[name] = len(names)
+            names.append(name)
+            self.pending_names.append(f"{kind}\t{name}\n")
+        return entry
+
+    def record(self, clip, selection, truth, model, response, user=""):
+        """Protokolliert eine Antwort; gibt True zurück, wenn der Puffer geschrieben werden sollte."""
+        with self.lock:
+            clip_id = self.intern(self.clip_ids, self.clip_names, "C", clip)
+            user_id = self.intern(self.user_ids, self.user_names, "U", user or "")
+            codes = emotion_code(selection), emotion_code(truth), emotion_code(model)
+            self.pending += RECORD.pack(time.time(), clip_id, user_id, response, *codes)
+            self.pending_count += 1
+            self.stats.add(clip_id, *codes, response)
+            return self.pending_count >= self.buffer_records
+
+    def flush(self):
+        """Schreibt gepufferte Namen und Datensätze ans Dateiende (Namen zuerst)."""
+        with self.write_lock:
+            with self.lock:
+                names, self.pending_names = self.pending_names, []
+                data, self.pending = self.pending, bytearray()
+                self.pending_count = 0
+            if names:
+                with open(self.names_path, "a", encoding="utf-8") as f:
+                    f.writelines(names)
+                    f.flush()
+                    os.fsync(f.fileno())
+            if data:
+                with open(self.path, "ab") as f:
+                    f.write(data)
+
+    def clip_accuracy(self, clip):
+        clip_id = self.clip_ids.get(clip)
+        return self.stats.clip_accuracy(clip_id) if clip_id is not None else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Antwortprotokoll blockweise auswerten.")
+    parser.add_argument("log", help="Pfad ohne Endung, z.B. Daten/Antworten")
+    parser.add_argument("--chunk", type=int, default=65536, help="Datensätze pro Block")
+    parser.add_argument("--top", type=int, default=10, help="Anzahl schwierigster Clips")
+    args = parser.parse_args()
+
+    clip_names, user_names = read_names(args.log + ".names")
+    stats = AnswerStats()
+    users = set()
+    for chunk in iter_chunks(args.log + ".bin", args.chunk):
+        for _, clip_id, user_id, response, selection, truth, model in chunk:
+            stats.add(clip_id, selection, truth, model, response)
+            users.add(user_id)
+
+    print(f"{stats.total} Antworten von {len(users)} Nutzern zu {sum(1 for n in stats.shown if n)} Clips")
+    correct = sum(stats.human_correct)
+    model = sum(stats.model_correct)
+    if stats.total:
+        print(f"Besucher richtig: {correct / stats.total:.1%}, Modell richtig: {model / stats.total:.1%}")
+
+    print("\nVerwechslungsmatrix (Zeile: richtige Emotion, Spalte: Auswahl)")
+    print(" " * 14 + "".join(f"{emotion[:6]:>8}" for emotion in EMOTIONS))
+    for truth, emotion in enumerate(EMOTIONS):
+        print(f"{emotion:<14}" + "".join(f"{value:>8}" for value in stats.confusion_row(truth)))
+
+    ranked = sorted((clip_id for clip_id, shown in enumerate(stats.shown) if shown),
+                    key=lambda clip_id: stats.clip_accuracy(clip_id)[0])
+    print("\nSchwierigste Clips (Besucher-Quote / Modell-Quote / Antwortzeit):")
+    for clip_id in ranked[:args.top]:
+        human, model_rate, response = stats.clip_accuracy(clip_id)
+        name = clip_names[clip_id] if clip_id < len(clip_names) else f"#{clip_id}"
+        print(f"  {name:<32} {human:6.1%} {model_rate:6.1%} {response:6.2f}s  (n={stats.shown[clip_id]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import sys
+import threading
+import types
+
+# Ersatz für python-vlc (nur für Benchmarks): spielt nichts ab, meldet aber wie VLC nach einer
+# einstellbaren Verzögerung MediaPlayerTimeChanged aus einem eigenen Thread. open_ms simuliert
+# Öffnen und Demuxen einer Datei (play()), resume_ms das Fortsetzen eines pausierten Players.
+#
+# install() muss vor dem Import von main.py aufgerufen werden.
+
+open_ms = 40
+resume_ms = 2
+
+
+class EventType:
+    MediaPlayerTimeChanged = "MediaPlayerTimeChanged"
+    MediaPlayerPlaying = "MediaPlayerPlaying"
+    MediaPlayerVout = "MediaPlayerVout"
+
+
+class MediaParseFlag:
+    local = 0
+    network = 1
+
+
+class Media:
+    def __init__(self, path):
+        self.path = path
+
+    def parse_with_options(self, flags, timeout):
+        return 0
+
+    def get_mrl(self):
+        return self.path
+
+
+class EventManager:
+    def __init__(self):
+        self.callbacks = {}
+
+    def event_attach(self, event_type, callback, *args):
+        self.callbacks[event_type] = (callback, args)
+
+    def event_detach(self, event_type):
+        self.callbacks.pop(event_type, None)
+
+    def fire(self, event_type, delay_ms, still_current=lambda: True):
+        """Löst das Ereignis nach delay_ms aus, sofern still_current() dann noch wahr ist."""
+        entry = self.callbacks.get(event_type)
+        if entry is not None:
+            callback, args = entry
+
+            def deliver():
+                if still_current():
+                    callback(None, *args)
+            timer = threading.Timer(delay_ms / 1000, deliver)
+            timer.daemon = True
+            timer.start()
+
+
+class MediaPlayer:
+    def __init__(self):
+        self.media = None
+        self.events = EventManager()
+        self.paused = False
+        self.muted = False
+        self.plays = 0
+        # stop()/play() machen noch ausstehende Ereignisse ungültig, wie bei VLC
+        self.generation = 0
+
+    def event_manager(self):
+        return self.events
+
+    def set_hwnd(self, handle):
+        pass
+
+    def set_xwindow(self, handle):
+        pass
+
+    def set_media(self, media):
+        self.media = media
+
+    def get_media(self):
+        return self.media
+
+    def play(self):
+        self.plays += 1
+        self.paused = False
+        self.fire(open_ms)
+        return 0
+
+    def set_pause(self, pause):
+        if self.paused and not pause:
+            self.fire(resume_ms)
+        self.paused = bool(pause)
+
+    def fire(self, delay_ms):
+        self.generation += 1
+        generation = self.generation
+        self.events.fire(EventType.MediaPlayerTimeChanged, delay_ms, lambda: generation == self.generation)
+
+    def set_time(self, ms):
+        pass
+
+    def video_take_snapshot(self, num, path, width, height):
+        return -1  # kein Videobild
+
+    def audio_set_mute(self, mute):
+        self.muted = bool(mute)
+
+    def stop(self):
+        self.generation += 1
+        self.paused = False
+
+    def release(self):
+        pass
+
+
+class Instance:
+    def __init__(self, *args):
+        pass
+
+    def media_new(self, path):
+        return Media(path)
+
+    def media_player_new(self):
+        return MediaPlayer()
+
+
+def install():
+    """Registriert dieses Modul als vlc."""
+    module = types.ModuleType("vlc")
+    for name in ("EventType", "MediaParseFlag", "Media", "MediaPlayer", "Instance"):
+        setattr(module, name, getattr(sys.modules[__name__], name))
+    sys.modules["vlc"] = module
+    return module
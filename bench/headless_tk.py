@@ -0,0 +1,266 @@
+import heapq
+import itertools
+import sys
+import time
+import types
+
+# Headless-Ersatz für tkinter, damit ScienceNightApp ohne Display läuft (nur für Benchmarks).
+#
+# Widgets merken sich ihre Optionen und Kinder, zeichnen aber nichts. Die Wurzel hat eine echte,
+# zeitgesteuerte after()-Warteschlange, die run_until()/run_for() abarbeiten, wie es mainloop()
+# täte. Widget.created und Widget.destroyed zählen alle jemals erzeugten bzw. zerstörten Widgets
+# (für Allokationsvergleiche).
+#
+# install() muss vor dem Import von main.py aufgerufen werden.
+
+TOP, BOTTOM, LEFT, RIGHT = "top", "bottom", "left", "right"
+X, Y, BOTH = "x", "y", "both"
+NORMAL, DISABLED = "normal", "disabled"
+END = "end"
+
+
+class TclError(Exception):
+    pass
+
+
+class Widget:
+    created = 0
+    destroyed = 0
+
+    def __init__(self, master=None, **kw):
+        Widget.created += 1
+        self.master = master
+        self.kw = dict(kw)
+        self.children = []
+        self.bindings = {}
+        self.width = 800
+        self.height = 430
+        if master is not None:
+            master.children.append(self)
+
+    def config(self, **kw):
+        self.kw.update(kw)
+
+    configure = config
+
+    def cget(self, key):
+        return self.kw.get(key)
+
+    def __getitem__(self, key):
+        return self.kw.get(key, NORMAL if key == "state" else None)
+
+    def __setitem__(self, key, value):
+        self.kw[key] = value
+
+    def pack(self, **kw):
+        pass
+
+    def grid(self, **kw):
+        pass
+
+    def place(self, **kw):
+        pass
+
+    def pack_forget(self):
+        pass
+
+    def grid_remove(self):
+        pass
+
+    def grid_forget(self):
+        pass
+
+    def place_forget(self):
+        pass
+
+    def tkraise(self, *args):
+        pass
+
+    lift = tkraise
+
+    def bind(self, sequence, func, add=None):
+        self.bindings[sequence] = func
+
+    def destroy(self):
+        Widget.destroyed += 1
+        for child in list(self.children):
+            child.destroy()
+        if self.master is not None and self in self.master.children:
+            self.master.children.remove(self)
+
+    def winfo_children(self):
+        return list(self.children)
+
+    def winfo_exists(self):
+        return 1
+
+    def winfo_id(self):
+        return id(self)
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def winfo_reqheight(self):
+        return 40
+
+    def update(self):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+    def focus_set(self):
+        pass
+
+    def root(self):
+        widget = self
+        while widget.master is not None:
+            widget = widget.master
+        return widget
+
+    def after(self, ms, func=None, *args):
+        return self.root().schedule(ms, func, args)
+
+    def after_idle(self, func, *args):
+        return self.root().schedule(0, func, args)
+
+    def after_cancel(self, after_id):
+        self.root().cancelled.add(after_id)
+
+    def title(self, *args):
+        pass
+
+    def geometry(self, *args):
+        pass
+
+    def protocol(self, *args):
+        pass
+
+
+class Tk(Widget):
+    def __init__(self):
+        super().__init__(None)
+        self.queue = []
+        self.cancelled = set()
+        self.ids = itertools.count()
+        self.closed = False
+
+    def schedule(self, ms, func, args):
+        after_id = f"after#{next(self.ids)}"
+        heapq.heappush(self.queue, (time.perf_counter() + ms / 1000, after_id, func, args))
+        return after_id
+
+    def run_once(self):
+        """Führt den nächsten fälligen Callback aus. Gibt die Wartezeit bis zum nächsten zurück (oder None)."""
+        while self.queue:
+            due, after_id, func, args = self.queue[0]
+            if after_id in self.cancelled:
+                heapq.heappop(self.queue)
+                self.cancelled.discard(after_id)
+                continue
+            wait = due - time.perf_counter()
+            if wait > 0:
+                return wait
+            heapq.heappop(self.queue)
+            func(*args)
+            return 0
+        return None
+
+    def run_until(self, predicate, timeout=10.0):
+        """Arbeitet die Warteschlange ab, bis predicate() wahr ist. Gibt False bei Zeitüberschreitung zurück."""
+        end = time.perf_counter() + timeout
+        while not predicate():
+            if time.perf_counter() > end:
+                return False
+            wait = self.run_once()
+            if wait:
+                time.sleep(min(wait, 0.001))
+            elif wait is None:
+                time.sleep(0.001)
+        return True
+
+    def run_for(self, seconds):
+        end = time.perf_counter() + seconds
+        self.run_until(lambda: time.perf_counter() >= end, timeout=seconds + 1)
+
+    def mainloop(self):
+        while not self.closed:
+            wait = self.run_once()
+            time.sleep(min(wait or 0.001, 0.01))
+
+    def destroy(self):
+        super().destroy()
+        self.closed = True
+
+
+class Frame(Widget):
+    pass
+
+
+class Label(Widget):
+    pass
+
+
+class Button(Widget):
+    def invoke(self):
+        if self["state"] != DISABLED and self.kw.get("command"):
+            return self.kw["command"]()
+
+
+class Toplevel(Widget):
+    pass
+
+
+class Scrollbar(Widget):
+    def set(self, first, last):
+        self.kw["position"] = (first, last)
+
+
+class Canvas(Widget):
+    pass
+
+
+class Entry(Widget):
+    def __init__(self, master=None, **kw):
+        super().__init__(master, **kw)
+        self.text = ""
+
+    def get(self):
+        return self.text
+
+    def insert(self, index, text):
+        self.text = self.text + text if index == END else text + self.text
+
+    def delete(self, first, last=None):
+        self.text = ""
+
+
+class HeadlessPhotoImage:
+    """Ersatz für PIL.ImageTk.PhotoImage (behält nur das Bild und seine Größe)."""
+
+    def __init__(self, image=None, **kw):
+        self.image = image
+
+    def width(self):
+        return self.image.size[0]
+
+    def height(self):
+        return self.image.size[1]
+
+
+def install():
+    """Registriert dieses Modul als tkinter und ersetzt ImageTk.PhotoImage."""
+    module = sys.modules[__name__]
+    tkinter = types.ModuleType("tkinter")
+    for name in ("TOP", "BOTTOM", "LEFT", "RIGHT", "X", "Y", "BOTH", "NORMAL", "DISABLED", "END",
+                 "TclError", "Widget", "Tk", "Frame", "Label", "Button", "Toplevel", "Scrollbar",
+                 "Canvas", "Entry"):
+        setattr(tkinter, name, getattr(module, name))
+    sys.modules["tkinter"] = tkinter
+
+    from PIL import ImageTk
+    ImageTk.PhotoImage = HeadlessPhotoImage
+    return tkinter
@@ -0,0 +1,237 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Headless-Benchmark für ScienceNightApp: Spiellogik mit Ersatz-tkinter und Ersatz-vlc auf
+# synthetischen Daten in mehreren Größen. Ergebnisse gehen als JSON in eine Datei; mit --compare
+# werden die Mediane mit einem früheren Lauf verglichen.
+#
+# Aufruf z.B.: python bench/run_bench.py --sizes 100,1000,10000,100000 --output bench_results.json
+#              python bench/run_bench.py --sizes 1000 --compare bench_results.json
+
+BENCH_FOLDER = os.path.dirname(os.path.abspath(__file__))
+REPO_FOLDER = os.path.dirname(BENCH_FOLDER)
+sys.path.insert(0, REPO_FOLDER)
+sys.path.insert(0, BENCH_FOLDER)
+
+import fake_vlc  # noqa: E402
+import headless_tk  # noqa: E402
+import synthetic_data  # noqa: E402
+
+tk = headless_tk.install()
+fake_vlc.install()
+
+import main  # noqa: E402
+from leaderboard_view import LeaderboardTable  # noqa: E402
+
+# Alles, was im Benchmark nur wartet oder Dateien nebenher schreibt, wird abgeschaltet
+CONFIG = {
+    "answer_delay_ms": 0,
+    "catalog_refresh_ms": 10 ** 9,
+    "metrics_file": None,
+    "startup_log_file": None,
+    "stall_threshold_ms": 10 ** 6,
+}
+
+
+def summarize(seconds):
+    """Kennzahlen einer Messreihe in Millisekunden."""
+    if not seconds:
+        return None
+    ordered = sorted(seconds)
+    return {
+        "count": len(ordered),
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def wait(root, predicate, what, timeout=10.0):
+    if not root.run_until(predicate, timeout):
+        raise RuntimeError(f"Zeitüberschreitung beim Warten auf {what}")
+
+
+def login(app, name):
+    app.show_new_user_window()
+    app.username_entry.insert(0, name)
+    app.create_user()
+
+
+def bench_size(clips, users, cycles, repeats, think_ms):
+    """Misst einen Datensatz mit clips Clips und users Leaderboard-Nutzern."""
+    folder = tempfile.mkdtemp(prefix="sciencenight-bench-")
+    old_cwd = os.getcwd()
+    try:
+        start = time.perf_counter()
+        synthetic_data.generate(os.path.join(folder, "Daten"), clips, users)
+        setup = time.perf_counter() - start
+        os.chdir(folder)
+
+        widgets_before = headless_tk.Widget.created
+        root = tk.Tk()
+        start = time.perf_counter()
+        app = main.ScienceNightApp(root, CONFIG)
+        wait(root, lambda: app.startup.reported, "den Start", timeout=120)
+        startup = time.perf_counter() - start
+
+        # Spielrunden: Antwort bis Maske sichtbar, "Weiter" bis Emotionstasten bereit
+        login(app, "Benchmark")
+        wait(root, lambda: app.buttons_active, "die Emotionstasten")
+        reveal, cycle = [], []
+        widgets_cycles = headless_tk.Widget.created
+        destroyed_cycles = headless_tk.Widget.destroyed
+        for i in range(cycles):
+            root.run_for(think_ms / 1000)  # Bedenkzeit, in der die Maske vorgeladen wird
+            start = time.perf_counter()
+            app.emotion_selected(synthetic_data.EMOTIONS[i % len(synthetic_data.EMOTIONS)])
+            wait(root, lambda: app.mask_shown, "die Maske")
+            reveal.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            app.next_cycle()
+            wait(root, lambda: app.buttons_active, "die Emotionstasten")
+            cycle.append(time.perf_counter() - start)
+        widgets_per_cycle = (headless_tk.Widget.created - widgets_cycles) / max(cycles, 1)
+        destroyed_per_cycle = (headless_tk.Widget.destroyed - destroyed_cycles) / max(cycles, 1)
+
+        # Leaderboard: Fenster öffnen (RankIndex) und Sortieren einer Tabelle (geteilter Modus)
+        leaderboard_open, leaderboard_sort = [], []
+        rows = app.leaderboard_store.rows()
+        names = [row["Name"] for row in rows]
+        richtig = [row["Richtig"] for row in rows]
+        falsch = [row["Falsch"] for row in rows]
+        for _ in range(repeats):
+            leaderboard_open.append(timed(app.show_leaderboard))
+            app.leaderboard_window.destroy()
+            leaderboard_sort.append(timed(LeaderboardTable, names, richtig, falsch))
+
+        # Abmelden: Tk-Thread-Anteil und Dauer bis Journal und Snapshot geschrieben sind
+        logout, save = [], []
+        for i in range(repeats):
+            login(app, f"Benchmark {i}")
+            app.emotion_selected(synthetic_data.EMOTIONS[0])
+            logout.append(timed(app.user_logout))
+            start = time.perf_counter()
+            app.tasks.flush()
+            wait(root, lambda: app.tasks.outstanding == 0, "das Speichern")
+            save.append(time.perf_counter() - start)
+            app.next_cycle()
+            wait(root, lambda: app.buttons_active, "die Emotionstasten")
+
+        clip_player = app.clip_player.stats()
+        app.close()
+        total_widgets = headless_tk.Widget.created - widgets_before
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return {
+        "clips": clips,
+        "users": users,
+        "setup_s": setup,
+        "startup_ms": startup * 1000,
+        "mask_reveal": summarize(reveal),
+        "cycle": summarize(cycle),
+        "leaderboard_open": summarize(leaderboard_open),
+        "leaderboard_sort": summarize(leaderboard_sort),
+        "logout": summarize(logout),
+        "logout_save": summarize(save),
+        "click_to_first_frame": clip_player,
+        "widgets_per_cycle": widgets_per_cycle,
+        "widgets_destroyed_per_cycle": destroyed_per_cycle,
+        "widgets_total": total_widgets,
+    }
+
+
+def git_version():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=REPO_FOLDER,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unbekannt"
+
+
+def compare(old, new):
+    """Vergleicht die Mediane zweier Läufe je Größe und Messung."""
+    old_results = {(r["clips"], r["users"]): r for r in old["results"]}
+    print(f"Vergleich {old['version']} -> {new['version']}")
+    for result in new["results"]:
+        previous = old_results.get((result["clips"], result["users"]))
+        if previous is None:
+            continue
+        for key, value in result.items():
+            if not isinstance(value, dict) or "median_ms" not in value or not isinstance(previous.get(key), dict):
+                continue
+            before, after = previous[key]["median_ms"], value["median_ms"]
+            ratio = after / before if before else float("inf")
+            flag = "  langsamer" if ratio > 1.2 else ("  schneller" if ratio < 0.8 else "")
+            print(f"  {result['clips']:>7} {key:<18} {before:9.2f} ms -> {after:9.2f} ms  x{ratio:.2f}{flag}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Headless-Benchmark der Spiellogik.")
+    parser.add_argument("--sizes", default="100,1000,10000,100000", help="Anzahl Clips (kommagetrennt)")
+    parser.add_argument("--users", default=None, help="Anzahl Leaderboard-Nutzer je Größe (Standard: wie --sizes)")
+    parser.add_argument("--cycles", type=int, default=50, help="Spielrunden je Größe")
+    parser.add_argument("--repeats", type=int, default=5, help="Wiederholungen für Leaderboard und Abmelden")
+    parser.add_argument("--think-ms", type=int, default=100, help="Bedenkzeit vor jeder Antwort")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", default=None, help="Früheres Ergebnis-JSON zum Vergleich")
+    args = parser.parse_args()
+
+    sizes = [int(v) for v in args.sizes.split(",")]
+    users = [int(v) for v in args.users.split(",")] if args.users else sizes
+    if len(users) == 1:
+        users = users * len(sizes)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    report = {
+        "version": git_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "cycles": args.cycles,
+        "think_ms": args.think_ms,
+        "fake_vlc": {"open_ms": fake_vlc.open_ms, "resume_ms": fake_vlc.resume_ms},
+        "results": [],
+    }
+    for clips, user_count in zip(sizes, users):
+        result = bench_size(clips, user_count, args.cycles, args.repeats, args.think_ms)
+        report["results"].append(result)
+        print(f"{clips:>7} Clips / {user_count:>7} Nutzer: Start {result['startup_ms']:.0f} ms, "
+              f"Runde {result['cycle']['median_ms']:.2f} ms, Maske {result['mask_reveal']['median_ms']:.2f} ms, "
+              f"Leaderboard {result['leaderboard_open']['median_ms']:.2f} ms "
+              f"(Sortieren {result['leaderboard_sort']['median_ms']:.2f} ms), "
+              f"Abmelden {result['logout']['median_ms']:.2f} ms + Speichern {result['logout_save']['median_ms']:.2f} ms")
+
+    tmp_path = args.output + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_path, args.output)
+    print("Ergebnisse gespeichert:", args.output)
+
+    if previous is not None:
+        compare(previous, report)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,89 @@
+import argparse
+import csv
+import io
+import os
+import random
+
+# Erzeugt einen synthetischen Datenordner wie "Daten" für Benchmarks:
+#   RAVDESS/        N leere Clipdateien mit RAVDESS-ähnlichen Namen
+#   MaskeRAVDESS/   eine PNG-Maske pro Clip (wenige Varianten, Bytes werden wiederverwendet)
+#   Data_Lables.csv Name, Real, Model
+#   Leaderboard.csv M Nutzer plus die KI
+#
+# Aufruf z.B.: python bench/synthetic_data.py --clips 1000 --users 5000 --output /tmp/Daten
+
+EMOTIONS = ["Neutral", "Freude", "Trauer", "Wut", "Angst", "Ekel", "Überraschung"]
+EMOTION_CODES = ["01", "03", "04", "05", "06", "07", "08"]
+KI_NAME = "Die Emotions KI"
+
+
+def clip_names(count):
+    """RAVDESS-artige Namen; das letzte Feld (Schauspieler) zählt hoch, damit alle eindeutig sind."""
+    return [f"01-01-{EMOTION_CODES[i % len(EMOTION_CODES)]}-01-01-01-{i:06d}.mp4" for i in range(count)]
+
+
+def mask_variants(size=(320, 180), count=len(EMOTIONS)):
+    """Einige kleine PNG-Masken als Bytes (Verlauf mit rotem Fleck)."""
+    from PIL import Image, ImageDraw
+
+    variants = []
+    for i in range(count):
+        image = Image.new("RGB", size, (20 * i, 40, 80))
+        draw = ImageDraw.Draw(image)
+        x = (i + 1) * size[0] // (count + 2)
+        draw.ellipse((x, size[1] // 4, x + size[0] // 5, size[1] // 4 + size[1] // 3), fill=(230, 30, 30))
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        variants.append(buffer.getvalue())
+    return variants
+
+
+def generate(folder, clips, users, seed=0):
+    """Legt den Datenordner an und gibt die Clipnamen zurück."""
+    rng = random.Random(seed)
+    video_folder = os.path.join(folder, "RAVDESS")
+    mask_folder = os.path.join(folder, "MaskeRAVDESS")
+    os.makedirs(video_folder, exist_ok=True)
+    os.makedirs(mask_folder, exist_ok=True)
+
+    names = clip_names(clips)
+    variants = mask_variants()
+    rows = []
+    for i, name in enumerate(names):
+        open(os.path.join(video_folder, name), "wb").close()
+        with open(os.path.join(mask_folder, os.path.splitext(name)[0] + ".png"), "wb") as f:
+            f.write(variants[i % len(variants)])
+        real = EMOTIONS[i % len(EMOTIONS)]
+        model = real if rng.random() < 0.6 else rng.choice(EMOTIONS)
+        rows.append((name, real, model))
+
+    with open(os.path.join(folder, "Data_Lables.csv"), "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name", "Real", "Model"])
+        writer.writerows(rows)
+
+    with open(os.path.join(folder, "Leaderboard.csv"), "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name", "Richtig", "Falsch", "Anzahl", "Prozent"])
+        writer.writerow([KI_NAME, 800, 200, 1000, "80%"])
+        for i in range(users):
+            richtig, falsch = rng.randint(0, 40), rng.randint(0, 40)
+            anzahl = richtig + falsch
+            writer.writerow([f"Besucher {i:06d}", richtig, falsch, anzahl,
+                             f"{round(richtig / anzahl * 100) if anzahl else 0}%"])
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetischen Datenordner für Benchmarks erzeugen.")
+    parser.add_argument("--clips", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    generate(args.output, args.clips, args.users, args.seed)
+    print(f"{args.clips} Clips und {args.users} Nutzer in {args.output} erzeugt")
+
+
+if __name__ == "__main__":
+    main()
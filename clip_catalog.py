@@ -0,0 +1,177 @@
+import json
+import os
+
+import metrics
+
+
+class ClipCatalog:
+    """Hält die abspielbaren Clips im Speicher und gleicht sie nur bei Änderungen mit dem Dateisystem ab.
+
+    Der Katalog wird einmal beim Start aufgebaut (bevorzugt aus der Cache-Datei) und danach nur dann
+    neu eingelesen, wenn sich die mtime eines der Ordner geändert hat. Clips ohne Label-Zeile oder ohne
+    Maske werden markiert, damit der Rundenablauf nie das Dateisystem anfassen muss. Masken aus
+    einem Maskenarchiv zählen genauso wie lose Dateien im Maskenordner.
+    """
+
+    def __init__(self, video_folder, mask_folder, video_ext, mask_ext, video_info, cache_file=None,
+                 mask_archive=None):
+        self.video_folder = video_folder
+        self.mask_folder = mask_folder
+        self.mask_archive = mask_archive
+        self.video_ext = video_ext.lower()
+        self.mask_ext = mask_ext.lower()
+        self.video_info = video_info
+        self.cache_file = cache_file
+
+        self.video_mtime = None
+        self.mask_mtime = None
+        self.videos = set()
+        self.masks = set()
+
+        # Ergebnisse des Joins, werden bei jeder Änderung neu berechnet
+        self.playable = ()
+        self.missing_label = frozenset()
+        self.missing_mask = frozenset()
+
+        self.load_cache()
+        self.rebuild()
+        self.refresh()
+
+    # ===============================
+    # Dateisystem
+    # ===============================
+
+    @staticmethod
+    def folder_mtime(folder):
+        """Gibt die mtime eines Ordners zurück oder None, falls er nicht existiert."""
+        try:
+            return os.stat(folder).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def scan_folder(folder, ext):
+        """Liest alle Dateinamen mit der gegebenen Endung aus einem Ordner."""
+        names = set()
+        metrics.count("file_ops", op="dir_scan")
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name.lower().endswith(ext) and entry.is_file():
+                        names.add(entry.name)
+        except OSError as e:
+            print("Fehler beim Lesen des Ordners:", folder, e)
+        return names
+
+    def refresh(self):
+        """Gleicht den Katalog mit den Ordnern ab. Gibt True zurück, wenn sich etwas geändert hat."""
+        changed = False
+
+        video_mtime = self.folder_mtime(self.video_folder)
+        if video_mtime != self.video_mtime:
+            videos = self.scan_folder(self.video_folder, self.video_ext) if video_mtime is not None else set()
+            self.log_diff("Videos", self.videos, videos)
+            self.videos = videos
+            self.video_mtime = video_mtime
+            changed = True
+
+        mask_mtime = self.folder_mtime(self.mask_folder)
+        if mask_mtime != self.mask_mtime:
+            masks = self.scan_folder(self.mask_folder, self.mask_ext) if mask_mtime is not None else set()
+            self.masks = {os.path.splitext(name)[0] for name in masks}
+            self.mask_mtime = mask_mtime
+            changed = True
+
+        if changed:
+            self.rebuild()
+            self.save_cache()
+        return changed
+
+    @staticmethod
+    def log_diff(kind, old, new):
+        """Gibt hinzugekommene und entfernte Einträge aus, damit Änderungen nachvollziehbar bleiben."""
+        if not old:
+            return
+        added = len(new - old)
+        removed = len(old - new)
+        if added or removed:
+            print(f"{kind} aktualisiert: +{added} / -{removed}")
+
+    # ===============================
+    # Join mit video_info
+    # ===============================
+
+    def rebuild(self):
+        """Verknüpft die gefundenen Videos mit video_info und den vorhandenen Masken."""
+        missing_label = set()
+        missing_mask = set()
+        labelled = []
+        for name in sorted(self.videos):
+            if name not in self.video_info:
+                missing_label.add(name)
+                continue
+            labelled.append(name)
+            if not self.has_mask(name):
+                missing_mask.add(name)
+
+        # Ohne Label-Zeilen verhält sich die App wie bisher und spielt alle Videos ab
+        self.playable = tuple(labelled) if labelled else tuple(sorted(self.videos))
+        self.missing_label = frozenset(missing_label)
+        self.missing_mask = frozenset(missing_mask)
+
+        if missing_label:
+            print(f"{len(missing_label)} Videos ohne Label-Zeile")
+        if missing_mask:
+            print(f"{len(missing_mask)} Videos ohne Maske")
+
+    def has_mask(self, video_filename):
+        """Prüft ohne Dateisystemzugriff, ob für einen Clip eine Maske vorliegt."""
+        base_name = os.path.splitext(video_filename)[0]
+        if self.mask_archive is not None and base_name in self.mask_archive:
+            return True
+        return base_name in self.masks
+
+    # ===============================
+    # Persistenz
+    # ===============================
+
+    def load_cache(self):
+        """Lädt den zuletzt gespeicherten Katalog, damit der Start ohne Ordnerlisting auskommt."""
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("video_folder") != self.video_folder or cached.get("mask_folder") != self.mask_folder:
+                return
+            self.video_mtime = cached["video_mtime"]
+            self.mask_mtime = cached["mask_mtime"]
+            self.videos = set(cached["videos"])
+            self.masks = set(cached["masks"])
+        except Exception as e:
+            print("Fehler beim Laden des Clip-Katalogs:", e)
+            self.video_mtime = None
+            self.mask_mtime = None
+            self.videos = set()
+            self.masks = set()
+
+    def save_cache(self):
+        """Schreibt den Katalog atomar in die Cache-Datei."""
+        if not self.cache_file:
+            return
+        data = {
+            "video_folder": self.video_folder,
+            "mask_folder": self.mask_folder,
+            "video_mtime": self.video_mtime,
+            "mask_mtime": self.mask_mtime,
+            "videos": sorted(self.videos),
+            "masks": sorted(self.masks),
+        }
+        tmp_file = self.cache_file + ".tmp"
+        metrics.count("file_ops", op="catalog_write")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print("Fehler beim Speichern des Clip-Katalogs:", e)
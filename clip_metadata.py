@@ -0,0 +1,128 @@
+import csv
+import os
+import struct
+from array import array
+
+MAGIC = b"CLMD"
+VERSION = 1
+HEADER = struct.Struct("<4sIQqII")  # Magic, Version, CSV-Größe, CSV-mtime, Clips, Labels
+
+
+class ClipMetadata:
+    """Kompakte Label-Daten aller Clips (ersetzt das per iterrows aufgebaute Dict aus Dicts).
+
+    Emotionen werden als kleine Integer-Codes in zwei array('B')-Spalten gehalten, die Namen in einer
+    Liste mit Name->Index-Map. Ein Binär-Cache neben der CSV wird nur neu geschrieben, wenn sich
+    Größe oder mtime der CSV ändern; der Start kommt damit ohne pandas aus.
+    """
+
+    def __init__(self, names=(), real=(), model=(), labels=()):
+        self.names = list(names)
+        self.real = array("B", real)
+        self.model = array("B", model)
+        self.labels = list(labels)
+        self.label_codes = {label: code for code, label in enumerate(self.labels)}
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def lookup(self, name, default=("N/A", "N/A")):
+        """Gibt (richtige, modell) als Text zurück."""
+        i = self.index.get(name)
+        if i is None:
+            return default
+        return self.labels[self.real[i]], self.labels[self.model[i]]
+
+    def real_code(self, name):
+        """Code der richtigen Emotion eines Clips oder None."""
+        i = self.index.get(name)
+        return self.real[i] if i is not None else None
+
+    # ===============================
+    # Laden
+    # ===============================
+
+    @classmethod
+    def load(cls, csv_path, cache_path=None):
+        """Lädt die Daten aus dem Binär-Cache, falls aktuell, sonst aus der CSV (und schreibt den Cache)."""
+        try:
+            st = os.stat(csv_path)
+        except OSError as e:
+            print("Fehler beim Laden der CSV-Datei:", e)
+            return cls()
+
+        if cache_path:
+            cached = cls.read_cache(cache_path, st.st_size, st.st_mtime_ns)
+            if cached is not None:
+                return cached
+
+        try:
+            metadata = cls.read_csv(csv_path)
+        except Exception as e:
+            print("Fehler beim Laden der CSV-Datei:", e)
+            return cls()
+        if cache_path:
+            try:
+                metadata.write_cache(cache_path, st.st_size, st.st_mtime_ns)
+            except OSError as e:
+                print("Fehler beim Schreiben des Label-Caches:", e)
+        return metadata
+
+    @classmethod
+    def read_csv(cls, csv_path):
+        """Liest Name, Real und Model aus der CSV und interniert die Labels."""
+        names, real, model = [], array("B"), array("B")
+        label_codes = {}
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                names.append(row["Name"])
+                real.append(label_codes.setdefault(row["Real"], len(label_codes)))
+                model.append(label_codes.setdefault(row["Model"], len(label_codes)))
+        if len(label_codes) > 255:
+            raise ValueError("Zu viele verschiedene Labels für einen 1-Byte-Code")
+        return cls(names, real, model, label_codes)
+
+    @classmethod
+    def read_cache(cls, cache_path, csv_size, csv_mtime):
+        """Liest den Binär-Cache; None, wenn er fehlt, kaputt ist oder nicht zur CSV passt."""
+        try:
+            with open(cache_path, "rb") as f:
+                data = f.read()
+            magic, version, size, mtime, count, label_count = HEADER.unpack_from(data, 0)
+            if magic != MAGIC or version != VERSION or size != csv_size or mtime != csv_mtime:
+                return None
+            offset = HEADER.size
+            (labels_len,) = struct.unpack_from("<I", data, offset)
+            offset += 4
+            labels = data[offset:offset + labels_len].decode("utf-8").split("\n") if label_count else []
+            offset += labels_len
+            (names_len,) = struct.unpack_from("<I", data, offset)
+            offset += 4
+            names = data[offset:offset + names_len].decode("utf-8").split("\n") if count else []
+            offset += names_len
+            real = data[offset:offset + count]
+            model = data[offset + count:offset + 2 * count]
+            if len(names) != count or len(model) != count:
+                return None
+        except (OSError, struct.error, UnicodeDecodeError):
+            return None
+        return cls(names, real, model, labels)
+
+    def write_cache(self, cache_path, csv_size, csv_mtime):
+        """Schreibt den Binär-Cache atomar."""
+        labels = "\n".join(self.labels).encode("utf-8")
+        names = "\n".join(self.names).encode("utf-8")
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, csv_size, csv_mtime, len(self.names), len(self.labels)))
+            f.write(struct.pack("<I", len(labels)))
+            f.write(labels)
+            f.write(struct.pack("<I", len(names)))
+            f.write(names)
+            f.write(self.real.tobytes())
+            f.write(self.model.tobytes())
+        os.replace(tmp_path, cache_path)
@@ -0,0 +1,188 @@
+import os
+import time
+from collections import deque
+
+
+class ClipPlayer:
+    """Zwei VLC-Player im Wechsel, damit "Weiter" nur umschaltet statt den nächsten Clip kalt zu öffnen.
+
+    Jeder Player zeichnet in einen eigenen, übereinanderliegenden Frame. Während Antwort und Maske
+    angezeigt werden, öffnet preload() den nächsten Clip stumm im verdeckten Frame und hält ihn nach
+    dem ersten Frame an. play() hebt dann nur den Frame nach oben und setzt die Wiedergabe fort; ein
+    nicht vorgeladener Clip wird wie bisher im aktiven Player geöffnet.
+
+    Gemessen wird die Zeit vom Aufruf von play() bis zum ersten Zeitfortschritt des Players
+    (MediaPlayerTimeChanged), getrennt nach "warm" (vorgeladen) und "kalt". vlc_module und instance
+    können für Messungen ohne VLC durch Platzhalter mit derselben Schnittstelle ersetzt werden.
+    """
+
+    def __init__(self, vlc_module, instance, root, frames, preload=True, report_every=50, history=1000,
+                 preload_timeout=2.0):
+        self.vlc = vlc_module
+        self.instance = instance
+        self.root = root
+        self.frames = list(frames) if preload else list(frames)[:1]
+        self.preload_enabled = preload and len(self.frames) > 1
+        self.players = [instance.media_player_new() for _ in self.frames]
+        self.paths = [None] * len(self.players)
+        self.active = 0
+        self.report_every = report_every
+
+        # Vorgeladener Clip im verdeckten Player: Pfad, Status "opening" -> "ready"; zeigt er bis
+        # zur Frist keinen Frame, wird das Vorladen abgebrochen
+        self.standby_path = None
+        self.standby_state = None
+        self.preload_timeout = preload_timeout
+        self.preload_deadline = None
+        self.first_frame = [None] * len(self.players)
+
+        # Latenzmessung: Klickzeit, Player auf dessen ersten Frame gewartet wird, Ergebnisse je Modus
+        self.click_time = None
+        self.click_mode = None
+        self.waiting = None
+        self.latencies = {"warm": deque(maxlen=history), "kalt": deque(maxlen=history)}
+        self.measured = 0
+        self.reported = 0
+
+        for index, (player, frame) in enumerate(zip(self.players, self.frames)):
+            player.set_hwnd(frame.winfo_id())
+            player.event_manager().event_attach(self.vlc.EventType.MediaPlayerTimeChanged,
+                                                self.on_time_changed, index)
+        self.frames[self.active].tkraise()
+
+    @property
+    def player(self):
+        return self.players[self.active]
+
+    @property
+    def standby(self):
+        return (self.active + 1) % len(self.players)
+
+    # ===============================
+    # Wiedergabe
+    # ===============================
+
+    def play(self, path):
+        """Startet einen Clip; ist er vorgeladen, wird nur auf den verdeckten Player umgeschaltet."""
+        if self.report_every and self.measured - self.reported >= self.report_every:
+            self.reported = self.measured
+            self.report()
+        self.click_time = time.perf_counter()
+        if self.preload_enabled and path == self.standby_path:
+            self.click_mode = "warm"
+            self.player.stop()
+            self.active = self.standby
+            self.standby_path = self.standby_state = None
+            self.waiting = self.active
+            self.frames[self.active].tkraise()
+            self.player.set_time(0)
+            self.player.audio_set_mute(False)
+            self.player.set_pause(0)
+        else:
+            self.click_mode = "kalt"
+            self.cancel_preload()
+            self.waiting = self.active
+            self.open(self.player, path)
+            self.player.play()
+
+    def stop(self):
+        self.player.stop()
+
+    def open(self, player, path):
+        """Erzeugt das Medium, lässt es im Hintergrund parsen und setzt es im Player."""
+        media = self.instance.media_new(path)
+        media.parse_with_options(self.vlc.MediaParseFlag.local, 0)
+        player.set_media(media)
+        player.audio_set_mute(False)
+        self.paths[self.players.index(player)] = path
+
+    def current_player(self, path):
+        """Gibt den aktiven Player zurück, sofern er path zeigt (sonst None). Im Tk-Thread aufrufen."""
+        return self.player if self.paths[self.active] == path else None
+
+    @staticmethod
+    def snapshot(player, image_path):
+        """Speichert den aktuellen Frame eines Players als Bild und gibt zurück, ob das gelang.
+
+        Blockiert, bis VLC das Bild geschrieben hat, und läuft deshalb im Worker-Thread; den Player
+        vorher im Tk-Thread mit current_player() bestimmen.
+        """
+        tmp_path = image_path + ".tmp" + os.path.splitext(image_path)[1]
+        if player.video_take_snapshot(0, tmp_path, 0, 0) != 0 or not os.path.exists(tmp_path):
+            return False
+        os.replace(tmp_path, image_path)
+        return True
+
+    # ===============================
+    # Vorladen
+    # ===============================
+
+    def preload(self, path):
+        """Öffnet den nächsten Clip stumm im verdeckten Player und hält ihn nach dem ersten Frame an."""
+        if not self.preload_enabled or path == self.standby_path:
+            return
+        self.cancel_preload()
+        index = self.standby
+        player = self.players[index]
+        self.open(player, path)
+        player.audio_set_mute(True)
+        self.first_frame[index] = None
+        self.standby_path = path
+        self.standby_state = "opening"
+        self.preload_deadline = time.perf_counter() + self.preload_timeout
+        player.play()
+        self.root.after(10, self.check_preload, path)
+
+    def check_preload(self, path):
+        """Hält den vorgeladenen Clip an, sobald er einen Frame gezeigt hat (im Tk-Thread)."""
+        if path != self.standby_path or self.standby_state != "opening":
+            return
+        player = self.players[self.standby]
+        if self.first_frame[self.standby] is None:
+            if time.perf_counter() >= self.preload_deadline:
+                print(f"Vorladen abgebrochen, kein Bild nach {self.preload_timeout:g} s:", path)
+                self.cancel_preload()
+                return
+            self.root.after(10, self.check_preload, path)
+            return
+        player.set_pause(1)
+        self.standby_state = "ready"
+
+    def cancel_preload(self):
+        if self.preload_enabled and self.standby_path is not None:
+            self.players[self.standby].stop()
+        self.standby_path = self.standby_state = None
+
+    # ===============================
+    # Messung
+    # ===============================
+
+    def on_time_changed(self, event, index):
+        """VLC-Callback (eigener Thread): nur Zeitstempel setzen, keine libvlc-Aufrufe."""
+        now = time.perf_counter()
+        if self.first_frame[index] is None:
+            self.first_frame[index] = now
+        if index == self.waiting and self.click_time is not None:
+            self.latencies[self.click_mode].append(now - self.click_time)
+            self.click_time = None
+            self.waiting = None
+            self.measured += 1
+
+    def stats(self):
+        """Median und 95. Perzentil der Klick-bis-erster-Frame-Latenz in Millisekunden je Modus."""
+        result = {}
+        for mode, values in self.latencies.items():
+            if not values:
+                continue
+            ordered = sorted(values)
+            result[mode] = {
+                "count": len(ordered),
+                "median_ms": ordered[len(ordered) // 2] * 1000,
+                "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+            }
+        return result
+
+    def report(self):
+        print("Klick bis erster Frame: " + " | ".join(
+            f"{mode} Median {s['median_ms']:.0f} ms, p95 {s['p95_ms']:.0f} ms (n={s['count']})"
+            for mode, s in self.stats().items()))
@@ -0,0 +1,135 @@
+import math
+import random
+
+
+class ClipScheduler:
+    """Wählt Clips ausgeglichen nach Emotion und ohne Wiederholung, bis alle Clips gezeigt wurden.
+
+    Die Clips werden einmal nach ihrer richtigen Emotion (video_info.real) in Buckets eingeteilt.
+    Pro Emotion gibt es einen Beutel, aus dem ohne Zurücklegen gezogen wird; die Emotion selbst
+    kommt aus einem Emotionsbeutel, der jede noch nicht erschöpfte Emotion einmal enthält. Dadurch
+    erscheint z.B. Neutral (RAVDESS-Codes 01 und 02) nicht doppelt so oft wie die anderen
+    Emotionen. Erst wenn alle Clips gezeigt wurden, beginnt eine neue Runde.
+
+    Gezogen wird mit einem schrittweisen Fisher-Yates: ein zufälliger noch offener Clip wird an das
+    Ende des offenen Bereichs getauscht, der Bereich schrumpft um eins. Ziehen und das Zurücksetzen
+    für eine neue Sitzung kosten damit O(1), unabhängig von der Anzahl der Clips.
+
+    Mit difficulty (Name -> Wert >= 0) und weight > 0 werden schwierige Clips früher gezogen: die
+    Beutel werden dann pro Sitzung einmal gewichtet gemischt (O(n log n)) und der Reihe nach geleert.
+    """
+
+    def __init__(self, clips, video_info, difficulty=None, weight=0.0, rng=None):
+        self.video_info = video_info
+        self.difficulty = difficulty or {}
+        self.weight = weight
+        self.rng = rng or random.Random()
+        self.buckets = {}
+        self.bags = {}
+        # Emotion -> Anzahl noch offener Clips am Anfang des Beutels; Clip -> Index im Beutel
+        self.remaining = {}
+        self.positions = {}
+        self.seen = set()
+        self.set_clips(clips)
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+    @property
+    def weighted(self):
+        return self.weight > 0 and bool(self.difficulty)
+
+    def set_clips(self, clips):
+        """Teilt die Clips neu ein (nur bei Katalogänderungen); bereits gezeigte bleiben gesperrt."""
+        clips = list(clips)
+        self.buckets = {}
+        for name in clips:
+            self.buckets.setdefault(self.video_info.real_code(name), []).append(name)
+        self.seen &= set(clips)
+        self.bags, self.remaining = {}, {}
+        for code, bucket in self.buckets.items():
+            ordered = self.weighted_order(bucket) if self.weighted else bucket
+            unseen = [name for name in ordered if name not in self.seen]
+            self.bags[code] = unseen + [name for name in ordered if name in self.seen]
+            self.remaining[code] = len(unseen)
+        self.index_positions()
+        self.refill_emotions()
+
+    def new_session(self, shown=()):
+        """Setzt alle Beutel zurück (neuer Besucher oder alle Clips gezeigt).
+
+        shown sind Clips, die schon zur neuen Sitzung zählen (der gerade laufende und der
+        vorgeladene); sie werden als gezeigt markiert.
+        """
+        self.seen = set()
+        if self.weighted:
+            self.bags = {code: self.weighted_order(bucket) for code, bucket in self.buckets.items()}
+            self.index_positions()
+        self.remaining = {code: len(bag) for code, bag in self.bags.items()}
+        for name in shown:
+            self.mark_seen(name)
+        self.refill_emotions()
+
+    def index_positions(self):
+        self.positions = {name: i for bag in self.bags.values() for i, name in enumerate(bag)}
+
+    def mark_seen(self, name):
+        """Nimmt einen Clip aus dem offenen Bereich seines Beutels, ohne ihn zu ziehen."""
+        i = self.positions.get(name)
+        if i is None or name in self.seen:
+            return
+        code = self.video_info.real_code(name)
+        bag = self.bags[code]
+        last = self.remaining[code] - 1
+        if self.weighted:
+            # Reihenfolge der übrigen Clips beibehalten
+            bag.insert(last, bag.pop(i))
+            for j in range(i, last + 1):
+                self.positions[bag[j]] = j
+        else:
+            self.swap(bag, i, last)
+        self.remaining[code] = last
+        self.seen.add(name)
+
+    def weighted_order(self, bucket):
+        """Gewichtet gemischte Kopie eines Buckets; der nächste Clip liegt am Ende."""
+        # Efraimidis-Spirakis: Schlüssel log(u)/w, größter Schlüssel zuerst
+        keys = {name: math.log(1.0 - self.rng.random()) / (1.0 + self.weight * self.difficulty.get(name, 0.0))
+                for name in bucket}
+        return sorted(bucket, key=keys.__getitem__)
+
+    def refill_emotions(self):
+        self.emotion_bag = [code for code, remaining in self.remaining.items() if remaining]
+        self.rng.shuffle(self.emotion_bag)
+
+    def draw(self, code):
+        """Zieht einen noch offenen Clip einer Emotion (oder None, wenn sie erschöpft ist)."""
+        remaining = self.remaining[code]
+        if not remaining:
+            return None
+        bag = self.bags[code]
+        last = remaining - 1
+        if not self.weighted:
+            self.swap(bag, self.rng.randrange(remaining), last)
+        self.remaining[code] = last
+        self.seen.add(bag[last])
+        return bag[last]
+
+    def swap(self, bag, i, j):
+        bag[i], bag[j] = bag[j], bag[i]
+        self.positions[bag[i]] = i
+        self.positions[bag[j]] = j
+
+    def next(self):
+        """Gibt den nächsten Clip zurück (oder None, wenn keine Clips vorhanden sind)."""
+        while True:
+            while self.emotion_bag:
+                name = self.draw(self.emotion_bag.pop())
+                if name is not None:
+                    return name
+            if not self.buckets:
+                return None
+            self.refill_emotions()
+            if not self.emotion_bag:
+                # Alle Clips gezeigt: neue Runde
+                self.new_session()
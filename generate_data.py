@@ -1,7 +1,20 @@
+import argparse
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 
-folder_path = "Daten\RAVDESS" 
+# Baut den Clip-Katalog (Data_Lables.csv) aus den Dateinamen in Daten/RAVDESS.
+#
+# RAVDESS-Dateinamen bestehen aus sieben Feldern, z.B. 01-01-03-02-01-02-12.mp4:
+# Modalität - Kanal - Emotion - Intensität - Satz - Wiederholung - Schauspieler.
+# Es werden nur neue oder geänderte Dateien verarbeitet (Manifest mit Größe und mtime).
+# Die App liest die CSV über clip_metadata.py, das daneben einen eigenen Binär-Cache anlegt.
+
+folder_path = os.path.join("Daten", "RAVDESS")
+output_csv = os.path.join("Daten", "Data_Lables.csv")
 
 # Mapping für die Emotionen nach RAVDESS Schema
 emotion_map = {
@@ -15,28 +28,138 @@ emotion_map = {
     "08": "Überraschung"
 }
 
-# get all names
-file_list = [f for f in os.listdir(folder_path) if f.endswith('.mp4')]
+# Die übrigen Felder des Dateinamens
+field_maps = {
+    "Modalitaet": {"01": "Audio-Video", "02": "Video", "03": "Audio"},
+    "Kanal": {"01": "Sprache", "02": "Gesang"},
+    "Emotion": emotion_map,
+    "Intensitaet": {"01": "Normal", "02": "Stark"},
+    "Satz": {"01": "Kids are talking by the door", "02": "Dogs are sitting by the door"},
+    "Wiederholung": {"01": "1", "02": "2"},
+}
+field_order = ["Modalitaet", "Kanal", "Emotion", "Intensitaet", "Satz", "Wiederholung", "Schauspieler"]
+csv_columns = ["Name", "Real", "Model"]
+
+# Ab dieser Anzahl Dateien wird auf mehrere Prozesse verteilt
+parallel_threshold = 5000
+chunk_size = 2000
+
+
+def parse_name(file):
+    """Zerlegt einen RAVDESS-Dateinamen in seine sieben Felder (oder None bei fremden Namen)."""
+    parts = os.path.splitext(file)[0].split('-')
+    if len(parts) != 7:
+        return None
+    fields = {}
+    for field, code in zip(field_order, parts):
+        if field == "Schauspieler":
+            if not code.isdigit():
+                return None
+            fields[field] = int(code)
+        else:
+            fields[field] = field_maps[field].get(code, "Unknown")
+    return fields
+
+
+def process_chunk(folder, names):
+    """Liest Größe und mtime einer Gruppe von Dateien und zerlegt deren Namen (läuft im Worker)."""
+    rows = []
+    for name in names:
+        try:
+            st = os.stat(os.path.join(folder, name))
+        except OSError:
+            continue
+        rows.append((name, st.st_size, st.st_mtime_ns, parse_name(name)))
+    return rows
+
+
+def scan(folder, workers):
+    """Listet alle .mp4-Dateien mit os.scandir und verteilt stat/parsen bei großen Ordnern auf Prozesse."""
+    with os.scandir(folder) as entries:
+        names = sorted(entry.name for entry in entries if entry.name.endswith('.mp4') and entry.is_file())
+    if len(names) < parallel_threshold:
+        return process_chunk(folder, names)
+    chunks = [names[i:i + chunk_size] for i in range(0, len(names), chunk_size)]
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(process_chunk, [folder] * len(chunks), chunks):
+            rows.extend(result)
+    return rows
+
+
+def load_previous(csv_path, manifest_path):
+    """Lädt das Ergebnis des letzten Laufs (CSV-Zeilen nach Name und Manifest)."""
+    if not (os.path.exists(csv_path) and os.path.exists(manifest_path)):
+        return {}, {}
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        previous = pd.read_csv(csv_path, dtype=str).set_index("Name", drop=False)
+        return previous.to_dict("index"), manifest
+    except Exception as e:
+        print("Vorheriger Lauf nicht lesbar, baue komplett neu:", e)
+        return {}, {}
+
+
+def build_frame(rows):
+    """Erstellt den Katalog als DataFrame mit kompakten kategorialen Spalten."""
+    df = pd.DataFrame(rows, columns=csv_columns + field_order)
+    for field in field_order:
+        if field == "Schauspieler":
+            df[field] = df[field].astype(np.uint8)
+        else:
+            df[field] = df[field].astype("category")
+    df["Real"] = df["Real"].astype("category")
+    df["Model"] = df["Model"].astype("category")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Data_Lables.csv aus den RAVDESS-Dateinamen erzeugen.")
+    parser.add_argument("--folder", default=folder_path)
+    parser.add_argument("--output", default=output_csv)
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--full", action="store_true", help="Manifest ignorieren und alles neu aufbauen")
+    args = parser.parse_args()
+
+    base = os.path.splitext(args.output)[0]
+    manifest_path = base + ".manifest.json"
+
+    previous, manifest = ({}, {}) if args.full else load_previous(args.output, manifest_path)
+    scanned = scan(args.folder, args.workers)
+
+    # Liste zum Speichern der Daten
+    data = []
+    new_manifest = {}
+    changed = 0
+    for file, size, mtime, fields in scanned:
+        if fields is None:
+            print("Unbekanntes Dateinamenformat, übersprungen:", file)
+            continue
+        new_manifest[file] = [size, mtime]
+        old = previous.get(file)
+        if old is not None and manifest.get(file) == [size, mtime]:
+            model = old["Model"]
+        else:
+            changed += 1
+            model = fields["Emotion"]  # Platzhalter, die Modellvorhersagen schreibt score_clips.py
+        data.append([file, fields["Emotion"], model] + [fields[field] for field in field_order])
 
-# Liste zum Speichern der Daten
-data = []
+    removed = len(set(manifest) - set(new_manifest))
+    print(f"{len(data)} Clips, {changed} neu/geändert, {removed} entfernt")
+    if not changed and not removed and not args.full and os.path.exists(args.output):
+        print("Keine Änderungen, Ausgabe ist aktuell")
+        return
 
-for file in file_list:
+    df = build_frame(data)
+    print(df)
 
-    base_name = os.path.splitext(file)[0]
-    parts = base_name.split('-')
-    
-    # Der 3. Teil entspricht der Emotion
-    emotion_code = parts[2]
-    emotion = emotion_map.get(emotion_code, "Unknown")
-    
-    data.append({
-        "Name": file,
-        "Real": emotion,
-        "Model": emotion  # TODO: Hier noch die funktion hinzufügen, die die model ergebnisse matcht
-    })
+    tmp_csv = args.output + ".tmp"
+    df[csv_columns].to_csv(tmp_csv, index=False, header=True)
+    os.replace(tmp_csv, args.output)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(new_manifest, f)
 
-df = pd.DataFrame(data)
 
-print(df)
-df.to_csv('Daten\Data_Lables.csv', index=False, header=True)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
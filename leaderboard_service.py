@@ -0,0 +1,355 @@
+import argparse
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+
+from leaderboard_store import LeaderboardStore
+
+# Gemeinsames Leaderboard für mehrere Stationen in einem Raum.
+#
+# Der Dienst spricht zeilenweises JSON über TCP:
+#   {"op": "submit", "items": [...]}   -> {"ok": true, "accepted": n, "rejected": m}
+#   {"op": "snapshot", "version": v}   -> {"version": v, "rows": [[Name, Richtig, Falsch], ...]}
+#                                         (ohne "rows", wenn sich seit v nichts geändert hat)
+# Items sind Antworten ({"type": "answer", "user", "correct"}) oder beendete Sitzungen
+# ({"type": "session", "user", "richtig", "falsch"}), jeweils mit "id" und "station".
+#
+# Start z.B.: python leaderboard_service.py --host 0.0.0.0 --port 8765
+# In main.py "leaderboard_service" auf "host:port" setzen, um eine Station als Client zu betreiben.
+
+DEFAULT_PORT = 8765
+
+
+class LeaderboardService:
+    """asyncio-Server, der Antworten und Sitzungen aller Stationen zu einem Leaderboard zusammenführt.
+
+    Beendete Sitzungen landen im LeaderboardStore (Snapshot + Journal). Antworten laufender
+    Sitzungen werden pro (Station, Nutzer) vorläufig mitgezählt, damit aktive Spieler anderer
+    Stationen schon vor dem Abmelden im Leaderboard auftauchen. Doppelt gesendete Items
+    (erneutes Senden nach Verbindungsabbruch) werden über ihre id erkannt.
+    """
+
+    def __init__(self, leaderboard_file, initial_rows=(("Die Emotions KI", 800, 200),), seen_limit=100000):
+        self.store = LeaderboardStore(leaderboard_file, initial_rows=initial_rows)
+        self.store.load()
+        self.live = {}
+        self.seen = set()
+        self.seen_order = deque()
+        self.seen_limit = seen_limit
+        # Versionen enthalten eine Kennung des Dienststarts, damit ein Neustart nie als "unverändert" gilt
+        self.instance = uuid.uuid4().hex[:8]
+        self.version = 0
+        self.snapshot_cache = None
+
+    def apply(self, item):
+        """Verarbeitet ein Item. Gibt False zurück, wenn es bereits verarbeitet wurde.
+
+        Ungültige Items lösen ValueError, KeyError oder TypeError aus, bevor etwas geändert wird;
+        ihre id gilt dann nicht als gesehen, ein korrigiertes Item wird also noch angenommen.
+        """
+        item_id = item.get("id")
+        if item_id in self.seen:
+            return False
+
+        key = (item.get("station"), item["user"])
+        if item["type"] == "answer":
+            correct = bool(item["correct"])
+            entry = self.live.setdefault(key, [0, 0])
+            entry[0 if correct else 1] += 1
+        elif item["type"] == "session":
+            richtig, falsch = int(item["richtig"]), int(item["falsch"])
+            self.live.pop(key, None)
+            # nur im Speicher; das Journal schreibt handle_connection() außerhalb des Event-Loops
+            self.store.add_session(item["user"], richtig, falsch)
+        else:
+            raise ValueError(f"Unbekannter Item-Typ: {item['type']}")
+
+        if item_id is not None:
+            self.seen.add(item_id)
+            self.seen_order.append(item_id)
+            if len(self.seen_order) > self.seen_limit:
+                self.seen.discard(self.seen_order.popleft())
+        self.version += 1
+        self.snapshot_cache = None
+        return True
+
+    def snapshot_rows(self):
+        """Gespeicherte Gesamtwerte plus laufende Sitzungen aller Stationen."""
+        if self.snapshot_cache is None:
+            totals = {name: [richtig, falsch] for name, richtig, falsch in
+                      ((row["Name"], row["Richtig"], row["Falsch"]) for row in self.store.rows())}
+            for (_, user), (richtig, falsch) in self.live.items():
+                entry = totals.setdefault(user, [0, 0])
+                entry[0] += richtig
+                entry[1] += falsch
+            self.snapshot_cache = [[name, richtig, falsch] for name, (richtig, falsch) in totals.items()]
+        return self.snapshot_cache
+
+    def handle_message(self, message):
+        if not isinstance(message, dict):
+            return {"ok": False, "error": "Nachricht ist kein JSON-Objekt"}
+        op = message.get("op")
+        version = f"{self.instance}-{self.version}"
+        if op == "submit":
+            accepted = rejected = 0
+            for item in message.get("items", []):
+                try:
+                    accepted += self.apply(item)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    # einzelnes fehlerhaftes Item verwerfen, statt den Batch endlos neu senden zu lassen
+                    print("Ungültiges Item verworfen:", item, e)
+                    rejected += 1
+            return {"ok": True, "accepted": accepted, "rejected": rejected}
+        if op == "snapshot":
+            if message.get("version") == version:
+                return {"version": version}
+            return {"version": version, "rows": self.snapshot_rows()}
+        return {"ok": False, "error": f"Unbekannte Operation: {op}"}
+
+    async def handle_connection(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    reply = self.handle_message(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    reply = {"ok": False, "error": str(e)}
+                if self.store.pending_rows:
+                    # Sitzungen vor der Bestätigung ins Journal schreiben; fsync nicht im Event-Loop
+                    await asyncio.get_running_loop().run_in_executor(None, self.store.write_journal)
+                writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError as e:
+            print("Verbindung abgebrochen:", peer, e)
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print("Leaderboard-Dienst läuft auf", ", ".join(str(s.getsockname()) for s in server.sockets))
+        async with server:
+            await server.serve_forever()
+
+
+class LeaderboardClient:
+    """Client-Modus einer Station: sendet Antworten und Sitzungen gebündelt im Hintergrund.
+
+    submit_answer() und submit_session() legen nur ein Item in eine Queue und kehren sofort
+    zurück; ein eigener Thread mit asyncio-Loop sendet die Queue in festen Abständen über eine
+    dauerhafte Verbindung. Ist der Dienst nicht erreichbar, werden die Items in eine Spool-Datei
+    geschrieben und nach dem Wiederverbinden nachgeliefert. Das gemeinsame Leaderboard wird
+    periodisch abgefragt und als Snapshot vorgehalten (snapshot()).
+    """
+
+    def __init__(self, host, port, station, spool_file, batch_interval=1.0, snapshot_interval=5.0,
+                 timeout=2.0, max_batch=500):
+        self.host = host
+        self.port = port
+        self.station = station
+        self.spool_file = spool_file
+        self.batch_interval = batch_interval
+        self.snapshot_interval = snapshot_interval
+        self.timeout = timeout
+        self.max_batch = max_batch
+
+        self.queue = queue.SimpleQueue()
+        self.reader = None
+        self.writer = None
+        self.online = False
+        self.last_snapshot_time = 0.0
+        self.snapshot_version = None
+        self.cached_snapshot = None
+
+        self.loop = None
+        self.stop_event = None
+        self.thread = threading.Thread(target=self.run_loop, name="leaderboard-client", daemon=True)
+
+    # ===============================
+    # Schnittstelle für die UI (nie blockierend)
+    # ===============================
+
+    def start(self):
+        self.thread.start()
+
+    def submit_answer(self, user, correct):
+        self.queue.put({"type": "answer", "user": user, "correct": bool(correct)})
+
+    def submit_session(self, user, richtig, falsch):
+        self.queue.put({"type": "session", "user": user, "richtig": richtig, "falsch": falsch})
+
+    def snapshot(self):
+        """Zuletzt empfangene Zeilen [[Name, Richtig, Falsch], ...] oder None."""
+        return self.cached_snapshot
+
+    def stop(self, timeout=5.0):
+        """Beendet den Client; nicht gesendete Items landen in der Spool-Datei."""
+        if self.loop is not None and self.stop_event is not None:
+            self.loop.call_soon_threadsafe(self.stop_event.set)
+        self.thread.join(timeout)
+
+    # ===============================
+    # Hintergrund-Thread
+    # ===============================
+
+    def run_loop(self):
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.loop.run_until_complete(self.run())
+        finally:
+            self.loop.close()
+
+    async def run(self):
+        self.stop_event = asyncio.Event()
+        while not self.stop_event.is_set():
+            try:
+                await asyncio.wait_for(self.stop_event.wait(), self.batch_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+            if time.monotonic() - self.last_snapshot_time >= self.snapshot_interval:
+                await self.fetch_snapshot()
+        await self.disconnect()
+        # was jetzt noch in der Queue liegt, wird beim nächsten Start gesendet
+        self.write_spool(self.drain_queue())
+
+    def drain_queue(self):
+        items = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                return items
+            item["id"] = uuid.uuid4().hex
+            item["station"] = self.station
+            items.append(item)
+
+    async def connect(self):
+        if self.writer is not None:
+            return
+        self.reader, self.writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        if not self.online:
+            print("Verbunden mit Leaderboard-Dienst", f"{self.host}:{self.port}")
+        self.online = True
+
+    async def disconnect(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+        self.reader = None
+        self.writer = None
+
+    async def request(self, message):
+        await self.connect()
+        self.writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        await self.writer.drain()
+        line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+        if not line:
+            raise ConnectionError("Verbindung vom Dienst geschlossen")
+        return json.loads(line)
+
+    async def offline(self, error):
+        if self.online:
+            print("Leaderboard-Dienst nicht erreichbar, schreibe in Spool-Datei:", error)
+        self.online = False
+        await self.disconnect()
+
+    async def flush(self):
+        """Sendet Spool-Datei und Queue in Batches; bei Fehlern wird alles gespoolt."""
+        items = self.read_spool() + self.drain_queue()
+        if not items:
+            return
+        sent = 0
+        try:
+            while sent < len(items):
+                batch = items[sent:sent + self.max_batch]
+                reply = await self.request({"op": "submit", "items": batch})
+                if not reply.get("ok"):
+                    raise ValueError(reply.get("error"))
+                sent += len(batch)
+        except (OSError, ConnectionError, asyncio.TimeoutError, ValueError) as e:
+            await self.offline(e)
+        self.replace_spool(items[sent:])
+
+    async def fetch_snapshot(self):
+        self.last_snapshot_time = time.monotonic()
+        try:
+            reply = await self.request({"op": "snapshot", "version": self.snapshot_version})
+        except (OSError, ConnectionError, asyncio.TimeoutError, ValueError) as e:
+            await self.offline(e)
+            return
+        if "rows" in reply:
+            self.cached_snapshot = reply["rows"]
+        self.snapshot_version = reply.get("version")
+
+    # ===============================
+    # Spool-Datei
+    # ===============================
+
+    def read_spool(self):
+        if not os.path.exists(self.spool_file):
+            return []
+        items = []
+        with open(self.spool_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    items.append(json.loads(line))
+                except ValueError:
+                    # abgeschnittene Zeile nach Absturz
+                    continue
+        return items
+
+    def write_spool(self, items):
+        if not items:
+            return
+        with open(self.spool_file, "a", encoding="utf-8") as f:
+            for item in items:
+                f.write(json.dumps(item) + "\n")
+
+    def replace_spool(self, items):
+        """Ersetzt die Spool-Datei durch die noch nicht gesendeten Items."""
+        if not items:
+            if os.path.exists(self.spool_file):
+                os.remove(self.spool_file)
+            return
+        tmp_file = self.spool_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            for item in items:
+                f.write(json.dumps(item) + "\n")
+        os.replace(tmp_file, self.spool_file)
+
+
+def parse_address(address):
+    """Wandelt "host:port" in (host, port) um."""
+    host, _, port = address.rpartition(":")
+    return (host or "127.0.0.1", int(port) if port else DEFAULT_PORT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gemeinsames Leaderboard für mehrere Stationen.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--leaderboard", default=os.path.join("Daten", "Leaderboard_Service.csv"))
+    args = parser.parse_args()
+
+    service = LeaderboardService(args.leaderboard)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.store.close()
+
+
+if __name__ == "__main__":
+    main()
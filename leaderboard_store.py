@@ -0,0 +1,212 @@
+import csv
+import os
+import threading
+
+import metrics
+
+COLUMNS = ["Name", "Richtig", "Falsch", "Anzahl", "Prozent"]
+
+
+def format_percent(richtig, falsch):
+    """Prozentangabe wie im Leaderboard ("80%"); ohne Antworten 0%."""
+    anzahl = richtig + falsch
+    return f"{round(richtig / anzahl * 100) if anzahl else 0}%"
+
+
+class LeaderboardStore:
+    """Leaderboard als Snapshot (Leaderboard.csv) plus Append-only-Journal.
+
+    Jede beendete Sitzung hängt eine kleine Zeile an das Journal an, statt die ganze CSV neu zu
+    schreiben. Die Zeile enthält die neuen Gesamtwerte des Nutzers (nicht die Differenz), dadurch
+    ist das Wiedereinspielen idempotent: ein Absturz während der Kompaktierung kann keine Sitzung
+    doppelt zählen. Die Kompaktierung schreibt den Snapshot im Hintergrund neu und verwirft das
+    bereits enthaltene Journal.
+    """
+
+    def __init__(self, snapshot_file, initial_rows=(), compact_every=200):
+        self.snapshot_file = snapshot_file
+        self.journal_file = snapshot_file + ".journal"
+        self.rotated_file = self.journal_file + ".old"
+        self.initial_rows = initial_rows
+        self.compact_every = compact_every
+
+        # Name -> [Richtig, Falsch], Reihenfolge wie im Snapshot
+        self.totals = {}
+        self.journal = None
+        self.journal_count = 0
+        self.lock = threading.Lock()
+        # Von add_session() vorgemerkte Journalzeilen; journal_lock hält write_journal() vom Tauschen
+        # bis zum fsync, damit die Zeilen in derselben Reihenfolge wie in totals ankommen
+        self.pending_rows = []
+        self.journal_lock = threading.Lock()
+        # Hält eine Kompaktierung vom Rotieren des Journals bis zum Entfernen des rotierten Journals
+        self.compaction_lock = threading.Lock()
+        self.compaction_thread = None
+
+    # ===============================
+    # Laden
+    # ===============================
+
+    def load(self):
+        """Liest Snapshot und Journal ein (bzw. legt den Snapshot mit den Startzeilen an)."""
+        self.totals = {}
+        if os.path.exists(self.snapshot_file):
+            try:
+                with open(self.snapshot_file, "r", encoding="utf-8", newline="") as f:
+                    for row in csv.DictReader(f):
+                        self.totals[row["Name"]] = [int(row["Richtig"]), int(row["Falsch"])]
+            except Exception as e:
+                print("Fehler beim Laden der Leaderboard CSV:", e)
+                self.totals = {}
+        else:
+            for name, richtig, falsch in self.initial_rows:
+                self.totals[name] = [richtig, falsch]
+            self.write_snapshot(self.totals)
+
+        # Ein übrig gebliebenes rotiertes Journal stammt aus einer unterbrochenen Kompaktierung
+        had_rotated = os.path.exists(self.rotated_file)
+        self.replay(self.rotated_file)
+        self.journal_count = self.replay(self.journal_file)
+
+        self.journal = open(self.journal_file, "a", encoding="utf-8", newline="")
+        if had_rotated:
+            self.compact(background=False)
+
+    def replay(self, path):
+        """Spielt ein Journal ein. Eine abgeschnittene letzte Zeile (Absturz beim Schreiben) wird ignoriert."""
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.reader(f):
+                try:
+                    name, richtig, falsch = row
+                    self.totals[name] = [int(richtig), int(falsch)]
+                except ValueError:
+                    print("Ungültige Journalzeile übersprungen:", row)
+                    continue
+                count += 1
+        return count
+
+    # ===============================
+    # Schreiben
+    # ===============================
+
+    def record_session(self, name, correct, wrong):
+        """Addiert eine Sitzung auf den Nutzer und hängt die neuen Gesamtwerte an das Journal an."""
+        self.add_session(name, correct, wrong)
+        self.write_journal()
+
+    def add_session(self, name, correct, wrong):
+        """Addiert eine Sitzung auf den Nutzer (nur im Speicher, z.B. im Tk-Thread).
+
+        Die neuen Gesamtwerte werden für das Journal vorgemerkt; write_journal() schreibt sie.
+        """
+        with self.lock:
+            entry = self.totals.setdefault(name, [0, 0])
+            entry[0] += correct
+            entry[1] += wrong
+            self.pending_rows.append([name, entry[0], entry[1]])
+
+    def write_journal(self):
+        """Hängt die vorgemerkten Zeilen an das Journal an (Worker-Thread) und stößt bei Bedarf die
+        Kompaktierung an."""
+        with self.journal_lock:
+            with self.lock:
+                rows, self.pending_rows = self.pending_rows, []
+            if not rows:
+                return
+            csv.writer(self.journal).writerows(rows)
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+            with self.lock:
+                self.journal_count += len(rows)
+                due = self.journal_count >= self.compact_every
+        metrics.count("file_ops", op="journal_append")
+        if due:
+            self.compact()
+
+    def compact(self, background=True):
+        """Schreibt den Snapshot neu und verwirft das darin enthaltene Journal.
+
+        Es läuft immer nur eine Kompaktierung: im Hintergrund wird übersprungen, solange eine
+        andere läuft (die nächste Sitzung stößt sie erneut an), im Vordergrund wird gewartet.
+        """
+        if not self.compaction_lock.acquire(blocking=not background):
+            return
+        try:
+            with self.journal_lock, self.lock:
+                totals = {name: list(entry) for name, entry in self.totals.items()}
+                self.journal.close()
+                if os.path.exists(self.rotated_file):
+                    # Vorherige Kompaktierung ist gescheitert: Journal anhängen statt überschreiben
+                    with open(self.journal_file, "r", encoding="utf-8", newline="") as src, \
+                            open(self.rotated_file, "a", encoding="utf-8", newline="") as dst:
+                        dst.write(src.read())
+                    os.remove(self.journal_file)
+                else:
+                    os.replace(self.journal_file, self.rotated_file)
+                self.journal = open(self.journal_file, "a", encoding="utf-8", newline="")
+                self.journal_count = 0
+        except BaseException:
+            self.compaction_lock.release()
+            raise
+
+        if background:
+            self.compaction_thread = threading.Thread(target=self.finish_compaction, args=(totals,),
+                                                      name="leaderboard-compaction")
+            self.compaction_thread.start()
+        else:
+            self.finish_compaction(totals)
+
+    def finish_compaction(self, totals):
+        """Zweiter Teil der Kompaktierung, läuft ohne self.lock (ggf. im Hintergrund) und gibt
+        compaction_lock frei."""
+        try:
+            self.write_snapshot(totals)
+            os.remove(self.rotated_file)
+        except OSError as e:
+            # Das rotierte Journal bleibt liegen und wird beim nächsten Start eingespielt
+            print("Fehler beim Kompaktieren des Leaderboards:", e)
+        finally:
+            self.compaction_lock.release()
+
+    def write_snapshot(self, totals):
+        """Schreibt den Snapshot atomar (temporäre Datei + os.replace)."""
+        tmp_file = self.snapshot_file + ".tmp"
+        metrics.count("file_ops", op="snapshot_write")
+        with open(tmp_file, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            for name, (richtig, falsch) in totals.items():
+                writer.writerow([name, richtig, falsch, richtig + falsch, format_percent(richtig, falsch)])
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.snapshot_file)
+
+    def close(self):
+        """Schreibt vorgemerkte Zeilen, wartet auf eine laufende Kompaktierung und schließt das Journal."""
+        if self.journal is not None:
+            self.write_journal()
+        if self.compaction_thread is not None:
+            self.compaction_thread.join()
+        with self.lock:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+
+    # ===============================
+    # Lesen
+    # ===============================
+
+    def get(self, name):
+        """Gibt (Richtig, Falsch) eines Nutzers zurück oder None."""
+        entry = self.totals.get(name)
+        return tuple(entry) if entry is not None else None
+
+    def rows(self):
+        """Alle Einträge als Liste von Dicts mit den Leaderboard-Spalten."""
+        with self.lock:
+            return [{"Name": name, "Richtig": richtig, "Falsch": falsch, "Anzahl": richtig + falsch,
+                     "Prozent": format_percent(richtig, falsch)}
+                    for name, (richtig, falsch) in self.totals.items()]
@@ -0,0 +1,193 @@
+import tkinter as tk
+
+KI_NAME = "Die Emotions KI"
+
+
+class LeaderboardTable:
+    """Spaltenweise, nach Quote sortierte Leaderboard-Daten (alle Berechnungen vektorisiert).
+
+    numpy wird erst beim Anlegen importiert; lokal reicht der RankIndex, die Tabelle wird nur für
+    Snapshots des geteilten Leaderboards gebraucht.
+    """
+
+    def __init__(self, names, richtig, falsch):
+        import numpy as np
+
+        richtig = np.asarray(richtig, dtype=np.int64)
+        falsch = np.asarray(falsch, dtype=np.int64)
+        anzahl = richtig + falsch
+        ratio = np.divide(richtig, anzahl, out=np.zeros(len(anzahl), dtype=np.float64), where=anzahl > 0)
+
+        # Quote absteigend, bei Gleichstand mehr Antworten zuerst (wie RankIndex)
+        order = np.lexsort((-anzahl, -ratio))
+        self.names = np.asarray(names, dtype=object)[order]
+        self.richtig = richtig[order]
+        self.falsch = falsch[order]
+        self.anzahl = anzahl[order]
+        self.ratio = ratio[order]
+        self.percent = np.rint(self.ratio * 100).astype(np.int64)
+
+        ki_rows = np.flatnonzero(self.names == KI_NAME)
+        self.ki_ratio = self.ratio[ki_rows[0]] if len(ki_rows) else 0.8
+
+    def __len__(self):
+        return len(self.names)
+
+    def position(self, name):
+        """Zeilenindex eines Namens in der sortierten Tabelle oder None."""
+        rows = (self.names == name).nonzero()[0]
+        return int(rows[0]) if len(rows) else None
+
+    def row(self, i):
+        """Gibt die anzuzeigenden Werte einer Zeile zurück."""
+        return (self.names[i], int(self.richtig[i]), int(self.falsch[i]), int(self.anzahl[i]),
+                f"{self.percent[i]}%", self.ratio[i])
+
+
+class VirtualLeaderboard:
+    """Scrollbare Leaderboard-Ansicht, die nur Widgets für die sichtbaren Zeilen anlegt.
+
+    Datenquelle ist eine LeaderboardTable oder ein RankIndex (len, row, position, ki_ratio).
+
+    Beim Scrollen werden die vorhandenen Zeilen-Widgets mit neuen Werten befüllt statt neue zu
+    erzeugen, die Öffnungszeit hängt daher nicht von der Anzahl der Nutzer ab.
+    """
+
+    def __init__(self, window, table, config, active_user=None):
+        self.window = window
+        self.table = table
+        self.config = config
+        self.active_user = active_user
+        self.first = 0
+        self.rows = []
+        self.capacity = config.get("leaderboard_initial_rows", 12)
+        self.row_height = None
+
+        # Header for leaderboard
+        header_frame = tk.Frame(window, padx=5, pady=5, bg="lightblue")
+        header_frame.pack(side=tk.TOP, fill=tk.X)
+        for column, (text, width) in enumerate([("Name", 12), ("Richtig", 8), ("Falsch", 8), ("Anzahl", 8), ("Prozent", 8)]):
+            tk.Label(header_frame, text=text, font=config["font"], width=width, bg="lightblue").grid(row=0, column=column, padx=5)
+
+        # Buttons
+        button_frame = tk.Frame(window)
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        tk.Button(button_frame, text="Zurück", command=window.destroy, font=config["font"]).pack(side=tk.RIGHT, padx=10, pady=10)
+        if active_user and table.position(active_user) is not None:
+            tk.Button(button_frame, text="Zu mir", command=self.jump_to_active_user, font=config["font"]).pack(side=tk.RIGHT, padx=10, pady=10)
+
+        # Rows and scrollbar
+        self.scrollbar = tk.Scrollbar(window, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.body = tk.Frame(window)
+        self.body.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.body.bind("<Configure>", self.on_resize)
+        for widget in (window, self.body):
+            widget.bind("<MouseWheel>", self.on_mousewheel)
+            widget.bind("<Button-4>", lambda e: self.scroll_to(self.first - 1))
+            widget.bind("<Button-5>", lambda e: self.scroll_to(self.first + 1))
+
+        self.ensure_rows(self.capacity)
+        self.render()
+
+    # ===============================
+    # Widget pool
+    # ===============================
+
+    def create_row(self):
+        """Erstellt ein wiederverwendbares Zeilen-Widget (Frame mit fünf Labels)."""
+        font = self.config["font"]
+        frame = tk.Frame(self.body, padx=5, pady=5, highlightthickness=2)
+        labels = [
+            tk.Label(frame, font=font, width=12),
+            tk.Label(frame, fg="green", font=font, width=8),
+            tk.Label(frame, fg="blue", font=font, width=8),
+            tk.Label(frame, font=font, width=8),
+            tk.Label(frame, font=font, width=8),
+        ]
+        for column, label in enumerate(labels):
+            label.grid(row=0, column=column, padx=5)
+        frame.grid(row=len(self.rows), column=0, sticky="ew", padx=5, pady=2)
+        return frame, labels
+
+    def ensure_rows(self, count):
+        """Vergrößert den Pool auf mindestens count Zeilen (höchstens so viele wie Einträge)."""
+        count = min(count, len(self.table))
+        while len(self.rows) < count:
+            self.rows.append(self.create_row())
+
+    @property
+    def visible(self):
+        return min(self.capacity, len(self.rows), len(self.table))
+
+    # ===============================
+    # Rendering
+    # ===============================
+
+    def render(self):
+        """Befüllt die Zeilen-Widgets mit den Einträgen ab self.first."""
+        for offset, (frame, labels) in enumerate(self.rows):
+            i = self.first + offset
+            if offset >= self.capacity or i >= len(self.table):
+                frame.grid_remove()
+                continue
+            name, richtig, falsch, anzahl, prozent, ratio = self.table.row(i)
+            # Colour of bourder: gray one for "AI", green for Ratio >= "AI", blue otherwise.
+            if name == KI_NAME:
+                border_color = "gray"
+            elif ratio >= self.table.ki_ratio:
+                border_color = "green"
+            else:
+                border_color = "blue"
+            # Highlight active user
+            bg_color = self.config["active_user_bg"] if self.active_user == name else "white"
+            frame.config(bg=bg_color, highlightbackground=border_color)
+            for label, text in zip(labels, (name, richtig, falsch, anzahl, prozent)):
+                label.config(text=text, bg=bg_color)
+            frame.grid()
+
+        total = len(self.table)
+        if total:
+            self.scrollbar.set(self.first / total, (self.first + self.visible) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, first):
+        """Setzt die erste sichtbare Zeile (begrenzt auf den gültigen Bereich) und zeichnet neu."""
+        first = max(0, min(int(first), len(self.table) - self.visible))
+        if first != self.first:
+            self.first = first
+            self.render()
+
+    def jump_to_active_user(self):
+        """Scrollt so, dass der aktive Nutzer in der Mitte der sichtbaren Zeilen steht."""
+        position = self.table.position(self.active_user)
+        if position is not None:
+            self.scroll_to(position - self.visible // 2)
+
+    # ===============================
+    # Events
+    # ===============================
+
+    def on_scrollbar(self, action, value, unit=None):
+        """Übersetzt Scrollbar-Befehle ("moveto"/"scroll") in eine erste sichtbare Zeile."""
+        if action == "moveto":
+            self.scroll_to(round(float(value) * len(self.table)))
+        elif action == "scroll":
+            step = self.visible if unit == "pages" else 1
+            self.scroll_to(self.first + int(value) * step)
+
+    def on_mousewheel(self, event):
+        self.scroll_to(self.first - (1 if event.delta > 0 else -1) * 3)
+
+    def on_resize(self, event):
+        """Passt die Größe des Pools an die verfügbare Höhe an."""
+        if not self.rows:
+            return
+        if self.row_height is None:
+            self.row_height = self.rows[0][0].winfo_reqheight() + 4
+        if self.row_height > 4:
+            self.capacity = max(1, event.height // self.row_height)
+            self.ensure_rows(self.capacity)
+            self.first = max(0, min(self.first, len(self.table) - self.visible))
+            self.render()
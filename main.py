@@ -1,12 +1,28 @@
+import time
+PROCESS_START = time.perf_counter()
+
 import tkinter as tk
-import vlc
-import pandas as pd
 import os
-import random
-from PIL import Image, ImageTk
+import socket
+from startup_timing import StartupTimer
+from task_runner import TaskRunner
+import metrics
+from stall_watchdog import StallWatchdog
+from clip_catalog import ClipCatalog
+from clip_player import ClipPlayer
+from clip_scheduler import ClipScheduler
+from clip_metadata import ClipMetadata
+from mask_pipeline import MaskPipeline, PrerenderedMasks
+from mask_archive import MaskArchive
+from mask_overlay import MaskOverlay
+from leaderboard_store import LeaderboardStore
+from answer_log import AnswerLog
+from leaderboard_view import LeaderboardTable, VirtualLeaderboard
+from rank_index import RankIndex, KI_NAME
+# vlc, PIL, numpy and the leaderboard service are imported lazily where they are needed
 
 class ScienceNightApp:
-    def __init__(self, root):
+    def __init__(self, root, config_overrides=None):
 
         # ===============================
         # Konfiguration, easy maintanance
@@ -15,11 +31,30 @@ class ScienceNightApp:
         self.config = {
             "csv_folder": "Daten",
             "csv_filename": "Data_Lables.csv",
+            "csv_cache_filename": "Data_Lables.cache",  # binary cache, rebuilt when the CSV changes
             "video_folder": os.path.join("Daten", "RAVDESS"),
             "mask_folder": os.path.join("Daten", "MaskeRAVDESS"),
+            "mask_archive": os.path.join("Daten", "MaskeRAVDESS.pack"),  # generated by mask_archive.py
+            "mask_render_folder": os.path.join("Daten", "MaskeRAVDESS_sizes"),  # generated by render_masks.py
+            "mask_size_tolerance": 0.05,
             "leaderboard_file": os.path.join("Daten", "Leaderboard.csv"),
+            "leaderboard_compact_every": 200,  # journal records before the snapshot is rewritten
+            "leaderboard_service": None,  # "host:port" of leaderboard_service.py for a shared leaderboard
+            "leaderboard_spool_file": os.path.join("Daten", "Leaderboard_Spool.jsonl"),
+            "station_name": socket.gethostname(),
+            "catalog_file": os.path.join("Daten", "Clip_Katalog.json"),
+            "catalog_refresh_ms": 30000,
+            "clip_difficulty_weight": 0.0,  # > 0: clips the model gets wrong are shown earlier in a session
             "video_ext": ".mp4",
             "mask_ext": ".png",
+            "mask_cache_size": 32,
+            "mask_cache_mb": 64,  # masks at window size take several MB each
+            "mask_resize_delay_ms": 200,  # the mask is re-rendered once the window size has settled
+            "mask_overlay": False,  # saliency map over a still frame of the clip instead of the mask image
+            "mask_overlay_alpha": 0.6,
+            "saliency_folder": os.path.join("Daten", "SaliencyRAVDESS"),  # generated by xai_masks.py
+            "still_folder": os.path.join("Daten", "Standbilder"),  # one frame per clip, saved while playing
+            "preload_next_clip": True,  # second VLC player opens the next clip while the answer is shown
             "window_title": "Lange Nacht der Wissenschaft",
             "window_size": "800x600",
             "top_frame_bg": "black",
@@ -35,27 +70,46 @@ class ScienceNightApp:
             "answers_frame_height": 80,
             "answer_fg": "#FFFFFF",
             "answer_font": ("Helvetica", 18, "bold"),
-            "active_user_bg": "#FFFF99"  # hellgelb
+            "active_user_bg": "#FFFF99",  # hellgelb
+            "leaderboard_initial_rows": 12,
+            "fast_start": True,  # show the window first, load data and player in a background thread
+            "startup_log_file": os.path.join("Daten", "Startzeiten.csv"),
+            "io_workers": 2,
+            "stall_threshold_ms": 150,  # event-loop lag above this is logged with the blocking function
+            "metrics_file": os.path.join("Daten", "metrics.prom"),  # Prometheus text format
+            "metrics_export_ms": 60000,
+            "profile_file": None,  # e.g. "Daten/profil.folded" to enable the sampling profiler
+            "profile_interval_ms": 5,
+            "answer_log": os.path.join("Daten", "Antworten"),  # .bin/.names, None disables the answer log
+            "answer_log_buffer": 256,  # answers kept in memory before they are written
+            "answer_log_flush_ms": 10000,
+            "answer_delay_ms": 1000  # emotion buttons appear this long after the clip starts
         }
+        self.config.update(config_overrides or {})
         
         # ===============================
         # Basic elements
         # ===============================
 
+        self.startup = StartupTimer(PROCESS_START, self.config["startup_log_file"])
+        self.startup.mark("imports")
+        
         self.root = root
         self.root.title(self.config["window_title"])
         self.root.geometry(self.config["window_size"])
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
-        # CSV-Data loading
-        self.csv_data = self.load_csv()
-        self.video_info = self.build_video_info(self.csv_data)
-        
-        # Leaderboard loading (Or initialisation)
-        self.load_leaderboard_csv()
+        # Blocking I/O runs on worker threads, results come back via root.after
+        self.tasks = TaskRunner(self.root, workers=self.config["io_workers"])
+        self.watchdog = StallWatchdog(self.root, threshold_ms=self.config["stall_threshold_ms"])
+        self.watchdog.start()
         
-        # VLC-Player instance
-        self.vlc_instance = vlc.Instance()
-        self.player = self.vlc_instance.media_player_new()
+        # Metrics export and optional sampling profiler (Tk thread)
+        self.profiler = None
+        if self.config["profile_file"]:
+            self.profiler = metrics.SamplingProfiler(self.config["profile_interval_ms"])
+            self.profiler.start()
+        self.root.after(self.config["metrics_export_ms"], self.export_metrics)
         
         # ===============================
         # User managment
@@ -65,61 +119,178 @@ class ScienceNightApp:
         self.user_correct = 0
         self.user_wrong = 0
         
-        # UI build
+        # UI build, buttons that need data stay disabled until loading has finished
         self.build_ui()
+        self.set_loading(True)
+        self.startup.mark("ui")
+        self.root.after_idle(self.startup.mark, "first_frame")
+        
+        # Data and player: in the background (fast start) or right here
+        if self.config["fast_start"]:
+            self.tasks.submit("Daten laden", self.load_data,
+                              on_done=lambda _: self.finish_startup(), on_error=self.startup_failed)
+        else:
+            self.load_data()
+            self.finish_startup()
+    
+    # ===============================
+    # Startup
+    # ===============================
+
+    def load_data(self):
+        """Lädt Labels, Clip-Katalog, Masken, Leaderboard und VLC (ohne Tk-Aufrufe, läuft im Hintergrund)."""
+        # CSV-Data loading
+        self.video_info = self.load_csv()
+        self.startup.mark("labels")
+        
+        # Packed masks (optional), loose files in mask_folder are the fallback
+        self.mask_archive = MaskArchive.open_optional(self.config["mask_archive"])
+        
+        # Clip catalog, built once, refreshed in the background of the main loop
+        self.clip_catalog = ClipCatalog(self.config["video_folder"], self.config["mask_folder"],
+                                        self.config["video_ext"], self.config["mask_ext"],
+                                        self.video_info, cache_file=self.config["catalog_file"],
+                                        mask_archive=self.mask_archive)
+        
+        # Scheduler: per-emotion shuffle bags, state is kept across cycles
+        self.clip_scheduler = ClipScheduler(self.clip_catalog.playable, self.video_info,
+                                            difficulty=self.clip_difficulty(),
+                                            weight=self.config["clip_difficulty_weight"])
+        self.startup.mark("catalog")
+        
+        # Mask pipeline, decodes and resizes masks while the video is playing
+        prerendered = PrerenderedMasks(self.config["mask_render_folder"], self.config["mask_ext"],
+                                       tolerance=self.config["mask_size_tolerance"])
+        self.mask_overlay = None
+        if self.config["mask_overlay"]:
+            self.mask_overlay = MaskOverlay(self.config["still_folder"], self.config["saliency_folder"],
+                                            self.config["mask_ext"], alpha=self.config["mask_overlay_alpha"])
+        self.mask_pipeline = MaskPipeline(self.config["mask_folder"], self.config["mask_ext"],
+                                          max_entries=self.config["mask_cache_size"],
+                                          max_bytes=self.config["mask_cache_mb"] * 1024 * 1024,
+                                          prerendered=prerendered, archive=self.mask_archive,
+                                          overlay=self.mask_overlay)
+        self.startup.mark("masks")
+        
+        # Leaderboard loading (Or initialisation)
+        self.load_leaderboard_csv()
+        self.startup.mark("leaderboard")
+        
+        # Answer log, aggregates are rebuilt from the existing log
+        self.answer_log = None
+        if self.config["answer_log"]:
+            self.answer_log = AnswerLog(self.config["answer_log"], self.config["answer_log_buffer"]).load()
+        self.startup.mark("answer_log")
+        
+        # VLC instance, the players are created on the Tk thread in finish_startup
+        import vlc
+        self.vlc = vlc
+        self.vlc_instance = vlc.Instance()
+        self.startup.mark("player")
+    
+    def finish_startup(self):
+        """Verbindet den Player mit dem Fenster, gibt die Buttons frei und startet den ersten Zyklus."""
+        self.clip_player = ClipPlayer(self.vlc, self.vlc_instance, self.root, self.video_frames,
+                                      preload=self.config["preload_next_clip"])
+        self.set_loading(False)
+        self.root.after(self.config["catalog_refresh_ms"], self.refresh_clip_catalog)
         
         # start first loop
         self.start_new_cycle()
+        self.root.after_idle(self.report_startup)
+    
+    def startup_failed(self, error):
+        """Laden im Hintergrund gescheitert: Fehler ausgeben, Buttons bleiben gesperrt."""
+        print("Fehler beim Start:", error)
+        self.username_label.config(text="Fehler beim Laden")
+    
+    def export_metrics(self, reschedule=True):
+        """Schreibt Metriken (und ggf. das Profil) im Hintergrund in ihre Dateien."""
+        if self.config["metrics_file"]:
+            self.tasks.submit("Metriken schreiben", metrics.REGISTRY.export, self.config["metrics_file"])
+        if self.profiler is not None:
+            self.tasks.submit("Profil schreiben", self.profiler.dump, self.config["profile_file"])
+        if reschedule:
+            self.root.after(self.config["metrics_export_ms"], self.export_metrics)
+    
+    def close(self):
+        """Schließt das Fenster, nachdem ausstehende Schreibvorgänge abgeschlossen sind."""
+        self.watchdog.stop()
+        if self.profiler is not None:
+            self.profiler.stop()
+        self.export_metrics(reschedule=False)
+        self.tasks.shutdown()
+        if getattr(self, "answer_log", None) is not None:
+            self.answer_log.flush()
+        if getattr(self, "leaderboard_client", None) is not None:
+            # sends what is queued or spools it for the next start
+            self.leaderboard_client.stop()
+        if hasattr(self, "leaderboard_store"):
+            self.leaderboard_store.close()
+            self.mask_pipeline.shutdown()
+        self.root.destroy()
+    
+    def report_startup(self):
+        """Erster Frame mit laufendem Video und freigegebenen Buttons: Startzeiten ausgeben."""
+        self.startup.mark("interactive")
+        self.startup.report()
+    
+    def set_loading(self, loading):
+        """Sperrt bzw. entsperrt die Buttons, die geladene Daten brauchen."""
+        state = tk.DISABLED if loading else tk.NORMAL
+        for button in (self.new_user_button, self.logout_button, self.leaderboard_button):
+            button.config(state=state)
+        if loading:
+            self.username_label.config(text="Lädt ...")
+        else:
+            self.update_user_info_display()
     
     # ===============================
     # CSV- and Data func
     # ===============================
 
     def load_csv(self):
-        """Lädt die CSV-Datei und gibt ein pandas DataFrame zurück."""
+        """Lädt die Labels aus der CSV-Datei (bzw. deren Binär-Cache) als kompakte ClipMetadata."""
         csv_path = os.path.join(self.config["csv_folder"], self.config["csv_filename"])
-        try:
-            data = pd.read_csv(csv_path)
-            return data
-        except Exception as e:
-            print("Fehler beim Laden der CSV-Datei:", e)
-            return pd.DataFrame()
-    
-    def build_video_info(self, csv_data):
-        """Erstellt ein Dictionary, das jedem Videodateinamen die zugehörigen Antworten zuordnet."""
-        info = {}
-        for _, row in csv_data.iterrows():
-            video_filename = row["Name"]
-            info[video_filename] = {
-                "richtige": row["Real"],
-                "modell": row["Model"]
-            }
-        return info
+        cache_path = os.path.join(self.config["csv_folder"], self.config["csv_cache_filename"])
+        return ClipMetadata.load(csv_path, cache_path)
+    
+    def refresh_clip_catalog(self):
+        """Gleicht den Clip-Katalog periodisch mit den Ordnern ab (im Hintergrund, nur bei geänderter mtime wird gelistet)."""
+        self.tasks.submit("Katalog abgleichen", self.clip_catalog.refresh, on_done=self.clip_catalog_refreshed)
+    
+    def clip_catalog_refreshed(self, changed):
+        if changed:
+            self.clip_scheduler.set_clips(self.clip_catalog.playable)
+        self.root.after(self.config["catalog_refresh_ms"], self.refresh_clip_catalog)
+    
+    def clip_difficulty(self):
+        """Schwierigkeit je Clip für den Scheduler: 1, wenn das Modell falsch liegt, sonst 0."""
+        if not self.config["clip_difficulty_weight"]:
+            return None
+        difficulty = {}
+        for name in self.clip_catalog.playable:
+            richtige, modell = self.video_info.lookup(name)
+            if richtige != modell:
+                difficulty[name] = 1.0
+        return difficulty
     
     def load_leaderboard_csv(self):
-        """Lädt die Leaderboard-Daten aus einer CSV-Datei oder erstellt sie, falls nicht vorhanden."""
-        leaderboard_file = self.config["leaderboard_file"]
-        if os.path.exists(leaderboard_file):
-            try:
-                self.leaderboard_data = pd.read_csv(leaderboard_file)
-            except Exception as e:
-                print("Fehler beim Laden der Leaderboard CSV:", e)
-                self.leaderboard_data = pd.DataFrame(columns=["Name", "Richtig", "Falsch", "Anzahl", "Prozent"])
-        else:
-            # Erstelle initiale Leaderboard-Daten mit dem KI-Eintrag
-            self.leaderboard_data = pd.DataFrame([{
-                "Name": "Die Emotions KI",
-                "Richtig": 800,
-                "Falsch": 200,
-                "Anzahl": 1000,
-                "Prozent": "80%"
-            }])
-            self.leaderboard_data.to_csv(leaderboard_file, index=False)
-    
-    def save_leaderboard_csv(self):
-        """Speichert die aktuellen Leaderboard-Daten in die CSV-Datei."""
-        leaderboard_file = self.config["leaderboard_file"]
-        self.leaderboard_data.to_csv(leaderboard_file, index=False)
+        """Lädt die Leaderboard-Daten (Snapshot plus Journal) oder erstellt sie, falls nicht vorhanden."""
+        self.leaderboard_store = LeaderboardStore(self.config["leaderboard_file"],
+                                                  initial_rows=[("Die Emotions KI", 800, 200)],
+                                                  compact_every=self.config["leaderboard_compact_every"])
+        self.leaderboard_store.load()
+        self.rank_index = RankIndex((row["Name"], row["Richtig"], row["Falsch"]) for row in self.leaderboard_store.rows())
+        
+        # Client mode: results are additionally sent to the shared leaderboard service
+        self.leaderboard_client = None
+        if self.config["leaderboard_service"]:
+            from leaderboard_service import LeaderboardClient, parse_address
+            host, port = parse_address(self.config["leaderboard_service"])
+            self.leaderboard_client = LeaderboardClient(host, port, self.config["station_name"],
+                                                        self.config["leaderboard_spool_file"])
+            self.leaderboard_client.start()
     
     # ===============================
     # UI-Aufbau
@@ -144,6 +315,8 @@ class ScienceNightApp:
         self.header_right.pack(side=tk.RIGHT, padx=10)
         self.username_label = tk.Label(self.header_right, text="Kein Nutzer", bg=self.config["header_bg"], font=self.config["font"])
         self.username_label.pack(side=tk.TOP)
+        self.rank_label = tk.Label(self.header_right, text="", bg=self.config["header_bg"], font=self.config["font"])
+        self.rank_label.pack(side=tk.TOP)
 
         self.stats_frame = tk.Frame(self.header_right, bg=self.config["header_bg"])
         self.stats_frame.pack(side=tk.TOP)
@@ -157,6 +330,17 @@ class ScienceNightApp:
         # --- Middle: Video ---
         self.top_frame = tk.Frame(self.root, bg=self.config["top_frame_bg"])
         self.top_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        # two stacked video frames, one per player (see clip_player.py)
+        self.video_frames = []
+        for _ in range(2):
+            frame = tk.Frame(self.top_frame, bg=self.config["top_frame_bg"])
+            frame.place(x=0, y=0, relwidth=1, relheight=1)
+            self.video_frames.append(frame)
+        self.current_video = None
+        self.next_video = None
+        # window resizes re-render a visible mask, debounced (see video_area_resized)
+        self.top_frame.bind("<Configure>", self.video_area_resized)
+        self.mask_resize_job = None
         
         # --- Down area ---
         self.bottom_frame = tk.Frame(self.root, bg=self.config["bottom_frame_bg"],
@@ -181,7 +365,13 @@ class ScienceNightApp:
         # Down Middle: Emotion Buttons
         self.center_frame = tk.Frame(self.buttons_frame, bg=self.config["bottom_frame_bg"])
         self.center_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.emotion_buttons = {}  # Wird beim Aktivieren der Buttons befüllt
+        self.emotion_buttons = {}
+        for emotion in self.config["emotions"]:
+            self.emotion_buttons[emotion] = tk.Button(self.center_frame, text=emotion,
+                                                      command=lambda em=emotion: self.emotion_selected(em),
+                                                      relief="flat", font=self.config["font"], bg="#F0F0F0", fg="black")
+        self.buttons_active = False
+        self.selected_button = None
         
         # Down Right: Next Button
         self.right_frame = tk.Frame(self.buttons_frame, bg=self.config["bottom_frame_bg"], width=100)
@@ -193,12 +383,21 @@ class ScienceNightApp:
         
         # Updating
         self.top_frame.update()
-        self.player.set_hwnd(self.top_frame.winfo_id())
         
-        # Cache answer
-        self.answer_label = None
-        self.model_label = None
-        self.mask_label = None
+        # Answer texts and mask: created once, only shown and hidden per round
+        self.answer_label = tk.Label(self.answers_frame, fg=self.config["answer_fg"],
+                                     bg=self.config["bottom_frame_bg"], font=self.config["answer_font"])
+        self.answer_label.grid(row=0, column=0, padx=20, pady=10, sticky="w")
+        self.answer_label.grid_remove()
+        self.model_label = tk.Label(self.answers_frame, fg=self.config["answer_fg"],
+                                    bg=self.config["bottom_frame_bg"], font=self.config["answer_font"])
+        self.model_label.grid(row=0, column=1, padx=20, pady=10, sticky="w")
+        self.model_label.grid_remove()
+        self.mask_label = tk.Label(self.top_frame)
+        self.mask_image = None
+        self.mask_size = None
+        self.answer_shown = False
+        self.mask_shown = False
     
     # ===============================
     # User Methods
@@ -228,6 +427,8 @@ class ScienceNightApp:
             self.active_user = name
             self.user_correct = 0
             self.user_wrong = 0
+            self.start_clip_session()
+            self.update_live_rank()
             self.update_user_info_display()
         self.new_user_window.destroy()
     
@@ -238,201 +439,178 @@ class ScienceNightApp:
             self.active_user = None
             self.user_correct = 0
             self.user_wrong = 0
+            self.start_clip_session()
             self.update_user_info_display()
     
+    def start_clip_session(self):
+        """Neue Clip-Sitzung; der laufende und der vorgeladene Clip zählen schon dazu."""
+        self.clip_scheduler.new_session(shown=[video for video in (self.current_video, self.next_video) if video])
+    
     def update_user_info_display(self):
         """Aktualisiert die Anzeige des aktiven Nutzers und der Statistiken."""
         if self.active_user:
             self.username_label.config(text=self.active_user)
             self.correct_label.config(text=f"R: {self.user_correct}")
             self.wrong_label.config(text=f"F: {self.user_wrong}")
+            self.rank_label.config(text=self.rank_text())
         else:
             self.username_label.config(text="Kein Nutzer")
+            self.rank_label.config(text="")
             self.correct_label.config(text="R: 0")
             self.wrong_label.config(text="F: 0")
     
+    def update_live_rank(self):
+        """Trägt die Gesamtwerte des aktiven Nutzers (gespeichert + laufende Sitzung) in den Rangindex ein."""
+        if not self.active_user:
+            return
+        richtig, falsch = self.leaderboard_store.get(self.active_user) or (0, 0)
+        self.rank_index.update(self.active_user, richtig + self.user_correct, falsch + self.user_wrong)
+    
+    def rank_text(self):
+        """Text für den Header: Rang des aktiven Nutzers und Abstand zur KI."""
+        rank = self.rank_index.rank(self.active_user)
+        if rank is None:
+            return ""
+        text = f"Platz {rank} von {len(self.rank_index)}"
+        if self.active_user != KI_NAME and KI_NAME in self.rank_index:
+            gap = round((self.rank_index.ratio(self.active_user) - self.rank_index.ki_ratio) * 100)
+            text += f" | {abs(gap)}% {'vor' if gap >= 0 else 'hinter'} der KI"
+        return text
+    
+    @metrics.timed("archive_current_user")
     def archive_current_user(self):
-        """Archiviert den aktuellen Nutzer in der Leaderboard CSV."""
+        """Archiviert den aktuellen Nutzer im Leaderboard (eine Journalzeile im Hintergrund statt neuer CSV)."""
         if not self.active_user:
             return
-        name = self.active_user
-        if name in self.leaderboard_data["Name"].values:
-            idx = self.leaderboard_data[self.leaderboard_data["Name"] == name].index[0]
-            self.leaderboard_data.at[idx, "Richtig"] += self.user_correct
-            self.leaderboard_data.at[idx, "Falsch"] += self.user_wrong
-        else:
-            new_entry = {
-                "Name": name,
-                "Richtig": self.user_correct,
-                "Falsch": self.user_wrong
-            }
-            new_df = pd.DataFrame([new_entry])
-            self.leaderboard_data = pd.concat([self.leaderboard_data, new_df], ignore_index=True)
-        self.leaderboard_data["Anzahl"] = self.leaderboard_data["Richtig"] + self.leaderboard_data["Falsch"]
-        self.leaderboard_data["Prozent"] = (self.leaderboard_data["Richtig"] / self.leaderboard_data["Anzahl"] * 100).round().astype(int).astype(str) + "%"
-        self.save_leaderboard_csv()
+        # totals on the Tk thread so that a new login sees them at once; only the journal write runs on a worker
+        self.leaderboard_store.add_session(self.active_user, self.user_correct, self.user_wrong)
+        self.tasks.submit("Sitzung speichern", self.leaderboard_store.write_journal)
+        if self.leaderboard_client:
+            self.leaderboard_client.submit_session(self.active_user, self.user_correct, self.user_wrong)
     
+    @metrics.timed("show_leaderboard")
     def show_leaderboard(self):
         """Öffnet ein Fenster mit einem scrollbaren, spaltenbasierten Leaderboard.
-        Es wird eine Kopfzeile angezeigt. Der aktuelle Nutzer wird hervorgehoben."""
+        Es wird eine Kopfzeile angezeigt. Der aktuelle Nutzer wird hervorgehoben.
+        Es werden nur Widgets für die sichtbaren Zeilen erzeugt (siehe leaderboard_view.py)."""
         self.leaderboard_window = tk.Toplevel(self.root)
         self.leaderboard_window.title("Leaderboard")
         self.leaderboard_window.geometry("800x600")
         
-        # copy leaderboard data
-        temp_data = self.leaderboard_data.copy()
-        
-        # add activ user
-        if self.active_user:
-            if self.active_user in temp_data["Name"].values:
-                idx = temp_data[temp_data["Name"] == self.active_user].index[0]
-                temp_data.at[idx, "Richtig"] += self.user_correct
-                temp_data.at[idx, "Falsch"] += self.user_wrong
-            else:
-                new_entry = {"Name": self.active_user, "Richtig": self.user_correct, "Falsch": self.user_wrong}
-                new_df = pd.DataFrame([new_entry])
-                temp_data = pd.concat([temp_data, new_df], ignore_index=True)
-        
-        # Update stats
-        temp_data["Anzahl"] = temp_data["Richtig"] + temp_data["Falsch"]
-        temp_data["Prozent"] = (temp_data["Richtig"] / temp_data["Anzahl"] * 100).round().astype(int).astype(str) + "%"
-        # calc ratio
-        temp_data["ratio"] = temp_data.apply(lambda row: row["Richtig"] / row["Anzahl"] if row["Anzahl"] > 0 else 0, axis=1)
-        # relativ to "AI"
-        ki_row = temp_data[temp_data["Name"] == "Die Emotions KI"]
-        ki_ratio = ki_row.iloc[0]["ratio"] if not ki_row.empty else 0.8
-        
-        # Sort by Ratio
-        sorted_data = temp_data.sort_values(by="ratio", ascending=False)
-        
-        # activate scrolling
-        canvas = tk.Canvas(self.leaderboard_window)
-        scrollbar = tk.Scrollbar(self.leaderboard_window, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Header for leaderboard
-        header_frame = tk.Frame(scrollable_frame, padx=5, pady=5, bg="lightblue")
-        header_frame.grid(row=0, column=0, sticky="ew")
-        tk.Label(header_frame, text="Name", font=self.config["font"], width=12, bg="lightblue").grid(row=0, column=0, padx=5)
-        tk.Label(header_frame, text="Richtig", font=self.config["font"], width=8, bg="lightblue").grid(row=0, column=1, padx=5)
-        tk.Label(header_frame, text="Falsch", font=self.config["font"], width=8, bg="lightblue").grid(row=0, column=2, padx=5)
-        tk.Label(header_frame, text="Anzahl", font=self.config["font"], width=8, bg="lightblue").grid(row=0, column=3, padx=5)
-        tk.Label(header_frame, text="Prozent", font=self.config["font"], width=8, bg="lightblue").grid(row=0, column=4, padx=5)
-        
-        # generate rows
-        row_idx = 1
-        for _, row in sorted_data.iterrows():
-            # Colour of bourder: gray one for "AI", green for Ratio >= "AI", blue otherwise.
-            if row["Name"] == "Die Emotions KI":
-                border_color = "gray"
-            elif row["ratio"] >= ki_ratio:
-                border_color = "green"
-            else:
-                border_color = "blue"
-            # Highlight active user
-            bg_color = self.config["active_user_bg"] if self.active_user == row["Name"] else "white"
-            entry_frame = tk.Frame(scrollable_frame, padx=5, pady=5, bg=bg_color, highlightthickness=2, highlightbackground=border_color)
-            entry_frame.grid(row=row_idx, column=0, sticky="ew", padx=5, pady=2)
-            tk.Label(entry_frame, text=row["Name"], font=self.config["font"], width=12, bg=bg_color).grid(row=0, column=0, padx=5)
-            tk.Label(entry_frame, text=f'{row["Richtig"]}', fg="green", font=self.config["font"], width=8, bg=bg_color).grid(row=0, column=1, padx=5)
-            tk.Label(entry_frame, text=f'{row["Falsch"]}', fg="blue", font=self.config["font"], width=8, bg=bg_color).grid(row=0, column=2, padx=5)
-            tk.Label(entry_frame, text=f'{row["Anzahl"]}', font=self.config["font"], width=8, bg=bg_color).grid(row=0, column=3, padx=5)
-            tk.Label(entry_frame, text=row["Prozent"], font=self.config["font"], width=8, bg=bg_color).grid(row=0, column=4, padx=5)
-            row_idx += 1
-        
-        # "Zurück"-Button
-        tk.Button(self.leaderboard_window, text="Zurück", command=self.leaderboard_window.destroy, font=self.config["font"]).pack(pady=10, anchor="se")
+        # shared leaderboard (last cached snapshot), otherwise the local rank index,
+        # which is always sorted and already contains the live stats of the active user
+        shared_rows = self.leaderboard_client.snapshot() if self.leaderboard_client else None
+        if shared_rows is not None:
+            names, richtig, falsch = zip(*shared_rows) if shared_rows else ((), (), ())
+            data = LeaderboardTable(names, richtig, falsch)
+        else:
+            data = self.rank_index
+        self.leaderboard_view = VirtualLeaderboard(self.leaderboard_window, data, self.config, active_user=self.active_user)
     
     # ===============================
     # Zyklussteuerung und UI-Updates
     # ===============================
 
     def clear_video_area(self):
-        """Bereinigt den oberen Bereich und stoppt die Videowiedergabe."""
-        self.player.stop()
-        if self.answer_label:
-            self.answer_label.destroy()
-            self.answer_label = None
-        if self.model_label:
-            self.model_label.destroy()
-            self.model_label = None
-        if self.mask_label:
-            self.mask_label.destroy()
-            self.mask_label = None
-    
-    def clear_emotion_buttons(self):
-        """Entfernt alle Emotionstasten aus dem zentralen Bereich."""
+        """Blendet Antworttexte und Maske aus und stoppt die Videowiedergabe."""
+        self.clip_player.stop()
+        if self.answer_shown:
+            self.answer_label.grid_remove()
+            self.model_label.grid_remove()
+            self.answer_shown = False
+        if self.mask_shown:
+            self.mask_label.place_forget()
+            self.mask_shown = False
+    
+    def hide_emotion_buttons(self):
+        """Blendet die Emotionstasten aus (erzeugt werden sie nur einmal in build_ui)."""
         for btn in self.emotion_buttons.values():
-            btn.destroy()
-        self.emotion_buttons = {}
+            btn.pack_forget()
+        self.buttons_active = False
     
+    @metrics.timed("start_new_cycle")
     def start_new_cycle(self):
         """Startet einen neuen Zyklus: Video auswählen, abspielen und Emotionstasten aktivieren."""
         self.clear_video_area()
-        self.clear_emotion_buttons()
+        self.hide_emotion_buttons()
         self.next_button.config(state=tk.DISABLED)
         
-        # delete old text
-        for widget in self.answers_frame.winfo_children():
-            widget.destroy()
-        
-        # pick video by random
-        video_folder = self.config["video_folder"]
-        video_files = [f for f in os.listdir(video_folder) if f.lower().endswith(self.config["video_ext"])]
-        if not video_files:
-            print("Keine Videodateien gefunden im Ordner:", video_folder)
+        # next video: the one preloaded during the last answer, otherwise pick from the catalog
+        self.current_video = self.next_video or self.pick_clip()
+        self.next_video = None
+        if self.current_video is None:
+            print("Keine Videodateien gefunden im Ordner:", self.config["video_folder"])
             return
-        self.current_video = random.choice(video_files)
-        video_path = os.path.join(video_folder, self.current_video)
         
-        # load video in vlc
-        media = self.vlc_instance.media_new(video_path)
-        self.player.set_media(media)
-        self.player.play()
+        # play in vlc (a swap if the clip was preloaded)
+        self.clip_player.play(os.path.join(self.config["video_folder"], self.current_video))
+        
+        # prefetch mask while the video plays
+        if self.clip_catalog.has_mask(self.current_video):
+            self.mask_pipeline.prefetch(self.current_video, self.mask_target_size())
         
         # wait for 1 sek for lable buttons, preventing random clicking
-        self.root.after(1000, self.enable_emotion_buttons)
+        self.root.after(self.config["answer_delay_ms"], self.enable_emotion_buttons)
+    
+    def pick_clip(self):
+        """Nächster Clip aus dem Scheduler: ausgeglichen nach Emotion, ohne Wiederholung (oder None)."""
+        return self.clip_scheduler.next()
     
+    def mask_target_size(self):
+        """Gibt die aktuelle Größe des Videobereichs zurück, auf die die Maske skaliert wird."""
+        return (self.top_frame.winfo_width(), self.top_frame.winfo_height())
+    
+    @metrics.timed("enable_emotion_buttons")
     def enable_emotion_buttons(self):
-        """Erstellt und zeigt die Emotionstasten im zentralen Bereich an."""
-        for emotion in self.config["emotions"]:
-            btn = tk.Button(self.center_frame, text=emotion,
-                            command=lambda em=emotion: self.emotion_selected(em),
-                            relief="flat", font=self.config["font"], bg="#F0F0F0", fg="black")
+        """Zeigt die Emotionstasten im zentralen Bereich an; nur die zuletzt gewählte wird zurückgesetzt."""
+        if self.selected_button is not None:
+            self.selected_button.config(state=tk.NORMAL, bg="#F0F0F0")
+            self.selected_button = None
+        for btn in self.emotion_buttons.values():
             btn.pack(side=tk.LEFT, expand=True, fill=tk.BOTH, padx=5, pady=5)
-            self.emotion_buttons[emotion] = btn
+        self.buttons_active = True
+        self.buttons_shown_time = time.perf_counter()
+        
+        # still frame for the mask overlay, saved once per clip while it plays
+        if self.mask_overlay is not None and self.mask_overlay.needs_still(self.current_video):
+            self.save_still(self.current_video)
+    
+    def save_still(self, video):
+        """Speichert im Hintergrund den aktuellen Frame als Standbild für die Maskenüberlagerung."""
+        player = self.clip_player.current_player(os.path.join(self.config["video_folder"], video))
+        if player is None:
+            return
+        self.tasks.submit("Standbild speichern", ClipPlayer.snapshot, player, self.mask_overlay.still_path(video),
+                          on_done=lambda saved: self.still_saved(video, saved))
     
+    def still_saved(self, video, saved):
+        """Standbild liegt vor: Überlagerung für den laufenden Clip schon vorbereiten."""
+        if not saved:
+            return
+        self.mask_overlay.add_still(video)
+        if video == self.current_video and not self.mask_shown:
+            self.mask_pipeline.prefetch(video, self.mask_target_size())
+    
+    @metrics.timed("emotion_selected")
     def emotion_selected(self, selected_emotion):
         """
         Wird aufgerufen, wenn eine Emotion ausgewählt wurde.
-        - Hebt den gewählten Button hervor (grün, wenn korrekt; blau, wenn falsch) und entfernt die übrigen.
+        - Hebt den gewählten Button hervor (grün, wenn korrekt; blau, wenn falsch) und blendet die übrigen aus.
         - Deaktiviert weitere Klicks.
         - Stoppt die Videowiedergabe.
         - Zeigt modern formatierte Antworttexte im unteren Bereich an.
         - Lädt das Maskenbild (im oberen Bereich) und aktiviert den "Weiter"-Button.
         """
 
-        if all(btn["state"] == "disabled" for btn in self.emotion_buttons.values()):
+        if not self.buttons_active:
             return
         
-        # Deactivate buttons
-        for btn in self.emotion_buttons.values():
-            btn.config(state=tk.DISABLED)
+        self.reveal_time = time.perf_counter()
+        self.buttons_active = False
         
         # check answer
-        info = self.video_info.get(self.current_video, {"richtige": "N/A", "modell": "N/A"})
-        is_correct = (selected_emotion == info["richtige"])
+        richtige, modell = self.video_info.lookup(self.current_video)
+        is_correct = (selected_emotion == richtige)
         
         # update stats
         if self.active_user:
@@ -440,60 +618,97 @@ class ScienceNightApp:
                 self.user_correct += 1
             else:
                 self.user_wrong += 1
+            self.update_live_rank()
             self.update_user_info_display()
+            if self.leaderboard_client:
+                self.leaderboard_client.submit_answer(self.active_user, is_correct)
+        self.log_answer(selected_emotion, richtige, modell)
         
-        # highlight button in colour, green (Right) or blue (wrong)
+        # highlight button in colour, green (Right) or blue (wrong), hide the others
         for emotion, btn in self.emotion_buttons.items():
             if emotion == selected_emotion:
-                btn.config(bg="green" if is_correct else "blue")
+                btn.config(state=tk.DISABLED, bg="green" if is_correct else "blue")
+                self.selected_button = btn
             else:
-                btn.destroy()
+                btn.pack_forget()
         
-        self.player.stop()
-        
-        # Grid for lables
-        self.answer_label = tk.Label(self.answers_frame,
-                                     text=f"Richtige Antwort: {info['richtige']}",
-                                     fg=self.config["answer_fg"],
-                                     bg=self.config["bottom_frame_bg"],
-                                     font=self.config["answer_font"])
-        self.answer_label.grid(row=0, column=0, padx=20, pady=10, sticky="w")
+        self.clip_player.stop()
         
-        self.model_label = tk.Label(self.answers_frame,
-                                    text=f"Modell-Antwort: {info['modell']}",
-                                    fg=self.config["answer_fg"],
-                                    bg=self.config["bottom_frame_bg"],
-                                    font=self.config["answer_font"])
-        self.model_label.grid(row=0, column=1, padx=20, pady=10, sticky="w")
+        # Grid for lables (grid() restores the options given in build_ui)
+        self.answer_label.config(text=f"Richtige Antwort: {richtige}")
+        self.answer_label.grid()
+        self.model_label.config(text=f"Modell-Antwort: {modell}")
+        self.model_label.grid()
+        self.answer_shown = True
         
         # showing masks
-        # TODO: Hier statt der verwendeten dummy daten XAI für den jeweiligen clip zeigen.
-        mask_folder = self.config["mask_folder"]
-        mask_filename = os.path.splitext(self.current_video)[0] + self.config["mask_ext"]
-        mask_path = os.path.join(mask_folder, mask_filename)
-        if os.path.exists(mask_path):
-            try:
-                image = Image.open(mask_path)
-                top_width = self.top_frame.winfo_width()
-                top_height = self.top_frame.winfo_height()
-                if top_width > 0 and top_height > 0:
-                    image = image.resize((top_width, top_height), Image.Resampling.LANCZOS)
-                self.mask_image = ImageTk.PhotoImage(image)
-                self.mask_label = tk.Label(self.top_frame, image=self.mask_image)
-                self.mask_label.place(x=0, y=0, relwidth=1, relheight=1)
-            except Exception as e:
-                print("Fehler beim Laden des Maskenbildes:", e)
+        # XAI masks are generated from the model with xai_masks.py
+        if self.clip_catalog.has_mask(self.current_video):
+            self.show_mask(self.current_video)
         else:
-            print("Maskenbild nicht gefunden:", mask_path)
+            print("Maskenbild nicht gefunden:", self.mask_pipeline.mask_path(self.current_video))
+        
+        # preload the next clip while answer and mask are shown
+        self.next_video = self.pick_clip()
+        if self.next_video is not None:
+            self.clip_player.preload(os.path.join(self.config["video_folder"], self.next_video))
         
         # "Weiter"-Button activate
         self.next_button.config(state=tk.NORMAL)
     
+    def log_answer(self, selected_emotion, richtige, modell):
+        """Hängt die Antwort an das Antwortprotokoll an; geschrieben wird gepuffert im Hintergrund."""
+        if self.answer_log is None:
+            return
+        response = self.reveal_time - self.buttons_shown_time
+        if self.answer_log.record(self.current_video, selected_emotion, richtige, modell, response, self.active_user):
+            self.tasks.submit("Antworten speichern", self.answer_log.flush)
+        else:
+            self.tasks.debounce("answer_log", self.config["answer_log_flush_ms"], "Antworten speichern",
+                                self.answer_log.flush)
+    
+    def show_mask(self, video):
+        """Zeigt die Maske in der aktuellen Größe des Videobereichs; lädt sie noch, wird sie angezeigt,
+        sobald sie fertig ist (ohne die Loop zu blockieren). Eine sichtbare Maske wird nur ersetzt,
+        wenn sich die Größe geändert hat; bis dahin bleibt die alte stehen."""
+        if video != self.current_video or not self.answer_shown:
+            return
+        size = self.mask_target_size()
+        if self.mask_shown and size == self.mask_size:
+            return
+        future = self.mask_pipeline.load_async(video, size)
+        if future is not None and not future.done():
+            self.tasks.watch(future, lambda _: self.show_mask(video))
+            return
+        revealed = False
+        with metrics.span("mask_render"):
+            image = self.mask_pipeline.get(video, size)
+            if image is not None:
+                self.mask_image = image
+                self.mask_size = size
+                self.mask_label.config(image=image)
+                if not self.mask_shown:
+                    self.mask_label.place(x=0, y=0, relwidth=1, relheight=1)
+                    self.mask_label.lift()  # the clip player raises its video frames
+                    self.mask_shown = revealed = True
+        if revealed:
+            # answer click until the mask is on screen, including waiting for the loader
+            metrics.observe("mask_reveal", time.perf_counter() - self.reveal_time)
+    
+    def video_area_resized(self, event):
+        """<Configure> des Videobereichs: die Maske erst neu rendern, wenn die Größe eine Weile stabil ist."""
+        if not self.mask_shown:
+            return
+        if self.mask_resize_job is not None:
+            self.root.after_cancel(self.mask_resize_job)
+        self.mask_resize_job = self.root.after(self.config["mask_resize_delay_ms"], self.resize_mask)
+    
+    def resize_mask(self):
+        self.mask_resize_job = None
+        self.show_mask(self.current_video)
+    
     def next_cycle(self):
         """Wird beim Klick auf 'Weiter' aufgerufen und startet den nächsten Zyklus."""
-        self.clear_video_area()
-        self.clear_emotion_buttons()
-        self.next_button.config(state=tk.DISABLED)
         self.start_new_cycle()
 
 # ===============================
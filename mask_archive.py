@@ -0,0 +1,171 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+
+# Packt alle Masken eines Ordners in eine einzige Archivdatei, damit auf den Kiosk-Medien nicht
+# tausende kleine PNGs geöffnet werden müssen.
+#
+# Format: Header (Magic, Version, Länge des Index), danach der Index als JSON
+# {Clipname: [Offset, Länge]} und dahinter die unveränderten PNG-Daten hintereinander.
+# Aufruf z.B.: python mask_archive.py                  -> Daten/MaskeRAVDESS.pack
+#              python mask_archive.py --sizes-folder    -> zusätzlich Daten/MaskeRAVDESS_sizes/<Größe>.pack
+
+MAGIC = b"EMPK"
+VERSION = 1
+HEADER = struct.Struct("<4sIQ")
+ARCHIVE_EXT = ".pack"
+
+
+class MaskArchive:
+    """Liest ein Maskenarchiv über eine Memory-Map. Ein Zugriff ist ein Dictionary-Treffer plus Slice."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # leere Datei lässt sich nicht mappen
+            self.file.close()
+            raise ValueError(f"Leeres Maskenarchiv: {path}")
+        self.view = memoryview(self.map)
+        try:
+            self.index = self.read_index()
+        except ValueError:
+            self.close()
+            raise
+
+    def read_index(self):
+        """Liest Header und Index und prüft alle Einträge gegen die Dateigröße (ValueError bei Fehlern).
+
+        Ein abgeschnittenes Archiv (z.B. nach einem abgebrochenen Kopieren) wird damit beim Öffnen
+        erkannt und nicht erst beim Dekodieren einer Maske.
+        """
+        if len(self.map) < HEADER.size:
+            raise ValueError(f"Maskenarchiv abgeschnitten: {self.path}")
+        magic, version, index_size = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Kein gültiges Maskenarchiv: {self.path}")
+        data_start = HEADER.size + index_size
+        if data_start > len(self.map):
+            raise ValueError(f"Maskenarchiv abgeschnitten: {self.path}")
+        index = json.loads(bytes(self.view[HEADER.size:data_start]).decode("utf-8"))
+        if not isinstance(index, dict):
+            raise ValueError(f"Ungültiger Index im Maskenarchiv: {self.path}")
+        for name, entry in index.items():
+            if (not isinstance(entry, list) or len(entry) != 2
+                    or not all(isinstance(value, int) and value >= 0 for value in entry)
+                    or entry[0] < data_start):
+                raise ValueError(f"Ungültiger Indexeintrag {name!r} im Maskenarchiv: {self.path}")
+            if entry[0] + entry[1] > len(self.map):
+                raise ValueError(f"Maskenarchiv abgeschnitten ({name}): {self.path}")
+        return index
+
+    @classmethod
+    def open_optional(cls, path):
+        """Öffnet das Archiv, falls es existiert; sonst (oder bei Fehlern) None für den Ordner-Fallback."""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError) as e:
+            print("Fehler beim Öffnen des Maskenarchivs:", e)
+            return None
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def names(self):
+        """Alle im Archiv enthaltenen Clipnamen (ohne Dateiendung)."""
+        return self.index.keys()
+
+    def get(self, name):
+        """Gibt die PNG-Daten als memoryview (ohne Kopie) zurück oder None."""
+        entry = self.index.get(name)
+        if entry is None:
+            return None
+        offset, length = entry
+        return self.view[offset:offset + length]
+
+    def close(self):
+        """Gibt die Memory-Map frei; solange noch Slices verwendet werden, bleibt sie offen."""
+        try:
+            self.view.release()
+            self.map.close()
+        except BufferError:
+            return
+        self.file.close()
+
+
+def pack_folder(folder, archive_path, mask_ext=".png"):
+    """Schreibt alle Masken eines Ordners in ein Archiv. Gibt die Anzahl der gepackten Masken zurück."""
+    files = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(mask_ext):
+                files.append((os.path.splitext(entry.name)[0], entry.path, entry.stat().st_size))
+    files.sort()
+
+    # Offsets vorab berechnen: Header, Index, danach die Daten in Dateireihenfolge.
+    # Da die Länge des Index von den Offsets abhängt, wird iteriert bis sie stabil ist.
+    index_size = 0
+    while True:
+        offset = HEADER.size + index_size
+        index = {}
+        for name, _, size in files:
+            index[name] = [offset, size]
+            offset += size
+        index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+        if len(index_bytes) == index_size:
+            break
+        index_size = len(index_bytes)
+
+    tmp_path = archive_path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, VERSION, len(index_bytes)))
+        out.write(index_bytes)
+        for name, path, size in files:
+            with open(path, "rb") as f:
+                data = f.read()
+            if len(data) != size:
+                raise OSError(f"Datei hat sich beim Packen verändert: {path}")
+            out.write(data)
+    os.replace(tmp_path, archive_path)
+    return len(files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Masken in ein memory-mapped Archiv packen.")
+    parser.add_argument("--mask-folder", default=os.path.join("Daten", "MaskeRAVDESS"))
+    parser.add_argument("--output", default=None, help="Standard: <mask-folder>.pack")
+    parser.add_argument("--sizes-folder", nargs="?", const=os.path.join("Daten", "MaskeRAVDESS_sizes"), default=None,
+                        help="Zusätzlich jede vorgerenderte Größe (render_masks.py) packen")
+    parser.add_argument("--mask-ext", default=".png")
+    args = parser.parse_args()
+
+    output = args.output or args.mask_folder.rstrip("/\\") + ARCHIVE_EXT
+    count = pack_folder(args.mask_folder, output, args.mask_ext)
+    print(f"{count} Masken gepackt nach {output}")
+
+    if args.sizes_folder:
+        from mask_pipeline import parse_size
+        with os.scandir(args.sizes_folder) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                try:
+                    parse_size(entry.name)
+                except ValueError:
+                    continue
+                size_output = os.path.join(args.sizes_folder, entry.name + ARCHIVE_EXT)
+                count = pack_folder(entry.path, size_output, args.mask_ext)
+                print(f"{count} Masken gepackt nach {size_output}")
+
+
+if __name__ == "__main__":
+    main()
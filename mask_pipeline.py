@@ -0,0 +1,296 @@
+import io
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from mask_archive import MaskArchive, ARCHIVE_EXT
+from mask_overlay import composite
+
+
+def load_mask(source, size):
+    """Dekodiert ein Maskenbild und skaliert es auf die Zielgröße (läuft im Worker-Thread).
+
+    source ist entweder ein Dateipfad oder ein Slice aus einem MaskArchive.
+    PIL wird erst hier importiert, damit der Programmstart nicht darauf wartet.
+    """
+    from PIL import Image
+
+    if isinstance(source, str):
+        metrics.count("file_ops", op="mask_read")
+    else:
+        metrics.count("file_ops", op="mask_archive_read")
+        source = io.BytesIO(source)
+    with metrics.span("mask_decode"):
+        image = Image.open(source)
+        image.load()
+    if size is not None:
+        with metrics.span("mask_resize"):
+            image = image.resize(size, Image.Resampling.LANCZOS)
+    return image
+
+
+def load_overlay(still_source, saliency_source, size, alpha, fallback):
+    """Überlagerung aus Standbild und Saliency-Karte; bei Fehlern die normale Maske (fallback)."""
+    try:
+        return composite(still_source, saliency_source, size, alpha)
+    except Exception as e:
+        print("Überlagerung nicht möglich, zeige die Maske:", e)
+        return load_mask(*fallback)
+
+
+def size_dirname(size):
+    """Name des Unterordners für eine vorgerenderte Größe, z.B. "800x600"."""
+    return f"{size[0]}x{size[1]}"
+
+
+def parse_size(text):
+    """Wandelt "800x600" in (800, 600) um."""
+    width, height = text.lower().split("x")
+    return (int(width), int(height))
+
+
+class PrerenderedMasks:
+    """Index über die von render_masks.py vorgerenderten Masken (ein Unterordner pro Größe).
+
+    Der Ordner wird einmal beim Start gelistet; lookup() wählt danach ohne Dateisystemzugriff die
+    nächstliegende Größe aus, sofern sie innerhalb der Toleranz liegt. Liegt für eine Größe ein
+    gepacktes Archiv (<Größe>.pack, siehe mask_archive.py) vor, wird es dem Unterordner vorgezogen.
+    """
+
+    def __init__(self, folder, mask_ext, tolerance=0.05):
+        self.folder = folder
+        self.mask_ext = mask_ext
+        self.tolerance = tolerance
+        # (Breite, Höhe) -> Menge der Clip-Basisnamen bzw. MaskArchive
+        self.sizes = {}
+        self.archives = {}
+        self.reported_sizes = set()
+        self.scan()
+
+    def scan(self):
+        """Liest die vorhandenen Größen und die darin enthaltenen Masken ein."""
+        self.sizes = {}
+        self.archives = {}
+        if not self.folder or not os.path.isdir(self.folder):
+            return
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                name = entry.name
+                is_archive = name.endswith(ARCHIVE_EXT) and entry.is_file()
+                if is_archive:
+                    name = name[:-len(ARCHIVE_EXT)]
+                elif not entry.is_dir():
+                    continue
+                try:
+                    size = parse_size(name)
+                except ValueError:
+                    continue
+                if is_archive:
+                    archive = MaskArchive.open_optional(entry.path)
+                    if archive is not None:
+                        self.archives[size] = archive
+                        self.sizes.setdefault(size, set()).update(archive.names())
+                else:
+                    with os.scandir(entry.path) as files:
+                        self.sizes.setdefault(size, set()).update(
+                            os.path.splitext(f.name)[0] for f in files if f.name.lower().endswith(self.mask_ext))
+
+    def nearest_size(self, size):
+        """Gibt die nächstliegende vorgerenderte Größe innerhalb der Toleranz zurück (oder None)."""
+        best, best_error = None, None
+        for candidate in self.sizes:
+            error = max(abs(candidate[0] - size[0]) / size[0], abs(candidate[1] - size[1]) / size[1])
+            if best_error is None or error < best_error:
+                best, best_error = candidate, error
+        if best is None or best_error > self.tolerance:
+            if self.sizes and size not in self.reported_sizes:
+                self.reported_sizes.add(size)
+                print("Keine vorgerenderte Maskengröße passend zu", size_dirname(size))
+            return None
+        return best
+
+    def lookup(self, video_filename, size):
+        """Gibt die Quelle (Pfad oder Archiv-Slice) der vorgerenderten Maske zurück oder None."""
+        if size is None or not self.sizes:
+            return None
+        best = self.nearest_size(size)
+        if best is None:
+            return None
+        base_name = os.path.splitext(video_filename)[0]
+        if base_name not in self.sizes[best]:
+            return None
+        archive = self.archives.get(best)
+        if archive is not None and base_name in archive:
+            return archive.get(base_name)
+        return os.path.join(self.folder, size_dirname(best), base_name + self.mask_ext)
+
+
+class MaskPipeline:
+    """Lädt und skaliert Maskenbilder im Hintergrund und hält die Ergebnisse in einem LRU-Cache.
+
+    Schlüssel ist (Clip, Zielgröße, Überlagerung). prefetch() wird beim Start des Videos aufgerufen,
+    get() beim Aufdecken; liegt das Bild dann schon bereit, ist das Aufdecken nur noch ein
+    Label-Update.
+    PhotoImages werden erst in get() und damit im Tk-Thread erzeugt; danach wird das PIL-Bild
+    verworfen. Der Cache ist zusätzlich zur Anzahl durch max_bytes begrenzt (Schätzung 4 Byte pro
+    Pixel, so speichert Tk ein PhotoImage), da Masken in Fenstergröße schnell einige MB groß sind. Gibt es eine passende
+    vorgerenderte Größe, wird diese ohne Skalierung geladen. Originalmasken kommen aus dem
+    Maskenarchiv, falls vorhanden, sonst aus dem Maskenordner. Mit overlay (MaskOverlay) wird
+    stattdessen die Saliency-Karte über ein Standbild des Clips gelegt, sobald beides vorliegt.
+    """
+
+    def __init__(self, mask_folder, mask_ext, max_entries=32, workers=1, prerendered=None, archive=None,
+                 overlay=None, max_bytes=None):
+        self.mask_folder = mask_folder
+        self.mask_ext = mask_ext
+        self.prerendered = prerendered
+        self.archive = archive
+        self.overlay = overlay
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mask")
+
+        # key -> [PIL-Bild oder None, PhotoImage oder None, geschätzte Bytes]
+        self.cache = OrderedDict()
+        self.cache_bytes = 0
+        self.pending = {}
+        # key -> Fehler eines gescheiterten Ladevorgangs (None, sobald er gemeldet wurde);
+        # solche Masken werden nicht erneut geladen
+        self.failed = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def mask_path(self, video_filename):
+        """Gibt den Pfad der Maske zu einem Videodateinamen zurück."""
+        mask_filename = os.path.splitext(video_filename)[0] + self.mask_ext
+        return os.path.join(self.mask_folder, mask_filename)
+
+    def resolve(self, video_filename, size):
+        """Gibt (Quelle, Zielgröße fürs Skalieren) zurück; vorgerenderte Masken werden nicht skaliert."""
+        if self.prerendered is not None:
+            source = self.prerendered.lookup(video_filename, size)
+            if source is not None:
+                return source, None
+        if self.archive is not None:
+            source = self.archive.get(os.path.splitext(video_filename)[0])
+            if source is not None:
+                return source, size
+        return self.mask_path(video_filename), size
+
+    @staticmethod
+    def normalize_size(size):
+        """Ungültige Größen (Fenster noch nicht gezeichnet) bedeuten: nicht skalieren."""
+        if size is None or size[0] <= 0 or size[1] <= 0:
+            return None
+        return (int(size[0]), int(size[1]))
+
+    def key(self, video_filename, size):
+        """Cache-Schlüssel; eine Überlagerung braucht eine Zielgröße und ein vorhandenes Standbild."""
+        size = self.normalize_size(size)
+        overlay = self.overlay is not None and size is not None and self.overlay.available(video_filename)
+        return (video_filename, size, overlay)
+
+    def job(self, key):
+        """Ladefunktion und Argumente für einen Cache-Schlüssel."""
+        video_filename, size, overlay = key
+        if overlay:
+            return load_overlay, (*self.overlay.sources(video_filename), size, self.overlay.alpha,
+                                  self.resolve(video_filename, size))
+        return load_mask, self.resolve(video_filename, size)
+
+    def prefetch(self, video_filename, size):
+        """Startet das Laden der Maske im Hintergrund, falls sie noch nicht im Cache liegt."""
+        self.collect_finished()
+        key = self.key(video_filename, size)
+        if key in self.cache or key in self.pending or key in self.failed:
+            return
+        fn, args = self.job(key)
+        self.pending[key] = self.executor.submit(fn, *args)
+
+    def load_async(self, video_filename, size):
+        """Startet das Laden bei Bedarf und gibt den Future zurück (None, wenn die Maske im Cache liegt)."""
+        self.prefetch(video_filename, size)
+        return self.pending.get(self.key(video_filename, size))
+
+    def collect_finished(self):
+        """Übernimmt fertige Hintergrundergebnisse in den Cache, damit pending nicht anwächst."""
+        for key, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[key]
+            if future.cancelled():
+                continue
+            if future.exception() is not None:
+                self.failed[key] = future.exception()
+                continue
+            self.store(key, future.result())
+
+    def get(self, video_filename, size):
+        """Gibt die fertige Maske als PhotoImage zurück (oder None, falls sie nicht geladen werden kann)."""
+        key = self.key(video_filename, size)
+        if key in self.failed:
+            error = self.failed[key]
+            if error is not None:
+                print("Fehler beim Laden des Maskenbildes:", error)
+                self.failed[key] = None
+            return None
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.hits += 1
+            metrics.count("mask_cache", result="hit")
+            self.cache.move_to_end(key)
+        else:
+            future = self.pending.pop(key, None)
+            if future is not None and future.done():
+                self.hits += 1
+                metrics.count("mask_cache", result="prefetched")
+            else:
+                self.misses += 1
+                metrics.count("mask_cache", result="miss")
+            try:
+                if future is not None:
+                    image = future.result()
+                else:
+                    fn, args = self.job(key)
+                    image = fn(*args)
+            except Exception as e:
+                print("Fehler beim Laden des Maskenbildes:", e)
+                self.failed[key] = None
+                return None
+            entry = self.store(key, image)
+
+        if entry[1] is None:
+            from PIL import ImageTk
+            entry[1] = ImageTk.PhotoImage(entry[0])
+            entry[0] = None
+        return entry[1]
+
+    def store(self, key, image):
+        """Legt ein Bild im Cache ab und verdrängt die ältesten Einträge, solange eine Grenze überschritten ist."""
+        old = self.cache.pop(key, None)
+        if old is not None:
+            self.cache_bytes -= old[2]
+        entry = self.cache[key] = [image, None, image.width * image.height * 4]
+        self.cache_bytes += entry[2]
+        while len(self.cache) > 1 and (len(self.cache) > self.max_entries
+                                       or (self.max_bytes is not None and self.cache_bytes > self.max_bytes)):
+            self.cache_bytes -= self.cache.popitem(last=False)[1][2]
+        return entry
+
+    def stats(self):
+        """Gibt die Cache-Zähler zurück."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self.cache),
+            "bytes": self.cache_bytes,
+            "pending": len(self.pending),
+        }
+
+    def shutdown(self):
+        """Beendet den Worker, ohne auf ausstehende Ladevorgänge zu warten."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
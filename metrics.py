@@ -0,0 +1,158 @@
+import bisect
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Laufzeitmessung für die App: Spans (Histogramme) und Zähler in einem prozessweiten Register.
+#
+#   with metrics.span("mask_decode"): ...      bzw. @metrics.timed("emotion_selected")
+#   metrics.count("file_ops", op="journal_append")
+#
+# export() schreibt alles im Prometheus-Textformat in eine Datei (z.B. für node_exporter's
+# textfile collector oder zum Nachsehen nach einem Kiosk-Einsatz).
+
+PREFIX = "sciencenight"
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Metrics:
+    """Register für Span-Histogramme und Zähler (thread-sicher, ein Lock pro Aufzeichnung)."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        # Span-Name -> [Zähler je Bucket (+Inf am Ende), Summe, Anzahl]
+        self.histograms = {}
+        # (Name, sortierte Labels) -> Wert
+        self.counters = {}
+
+    def observe(self, name, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            histogram[0][index] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """Decorator: misst jeden Aufruf der Funktion als Span."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def render(self):
+        """Gibt alle Werte im Prometheus-Textformat zurück."""
+        with self.lock:
+            histograms = {name: ([*h[0]], h[1], h[2]) for name, h in self.histograms.items()}
+            counters = dict(self.counters)
+
+        lines = []
+        if histograms:
+            metric = f"{PREFIX}_span_seconds"
+            lines.append(f"# HELP {metric} Dauer der instrumentierten Abschnitte")
+            lines.append(f"# TYPE {metric} histogram")
+            for name in sorted(histograms):
+                bucket_counts, total, count = histograms[name]
+                cumulative = 0
+                for bound, bucket_count in zip((*self.buckets, "+Inf"), bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric}_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{span="{name}"}} {total:.6f}')
+                lines.append(f'{metric}_count{{span="{name}"}} {count}')
+
+        names = sorted({name for name, _ in counters})
+        for name in names:
+            metric = f"{PREFIX}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for (counter_name, labels), value in sorted(counters.items()):
+                if counter_name != name:
+                    continue
+                label_text = ",".join(f'{key}="{val}"' for key, val in labels)
+                lines.append(f"{metric}{{{label_text}}} {value}" if label_text else f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Schreibt den aktuellen Stand atomar in eine Datei."""
+        text = self.render()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+
+REGISTRY = Metrics()
+span = REGISTRY.span
+timed = REGISTRY.timed
+count = REGISTRY.count
+observe = REGISTRY.observe
+
+
+class SamplingProfiler:
+    """Optionaler Sampling-Profiler für einen Thread (Standard: den aufrufenden, also den Tk-Thread).
+
+    Ein Hintergrundthread liest alle interval_ms den Stack des Threads und zählt die Aufrufketten.
+    dump() schreibt sie im "folded"-Format (eine Zeile pro Kette: a;b;c Anzahl), das z.B.
+    flamegraph.pl oder speedscope direkt einlesen.
+    """
+
+    def __init__(self, interval_ms=5, thread_ident=None):
+        self.interval = interval_ms / 1000
+        self.thread_ident = thread_ident or threading.get_ident()
+        self.samples = Counter()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="sampling-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_ident)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                with self.lock:
+                    self.samples[";".join(reversed(stack))] += 1
+
+    def dump(self, path):
+        with self.lock:
+            samples = self.samples.copy()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        os.replace(tmp_path, path)
@@ -0,0 +1,217 @@
+import math
+import random
+
+KI_NAME = "Die Emotions KI"
+
+MAX_LEVELS = 24  # reicht für ~16 Mio. Einträge
+END_KEY = (math.inf, math.inf, "")
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, levels):
+        self.key = key
+        self.next = [None] * levels
+        self.width = [1] * levels
+
+
+def sort_key(name, richtig, falsch):
+    """Sortierschlüssel: Quote absteigend, bei Gleichstand mehr Antworten zuerst, dann Name."""
+    anzahl = richtig + falsch
+    ratio = richtig / anzahl if anzahl > 0 else 0.0
+    return (-ratio, -anzahl, name)
+
+
+class RankIndex:
+    """Hält alle Nutzer nach Quote sortiert (indizierbare Skipliste).
+
+    Namenssuche ist ein Dictionary-Zugriff (O(1)); Aktualisieren, Rang und Zugriff auf den i-ten
+    Eintrag kosten erwartet O(log n), top(k) O(log n + k). Damit kann der Rang nach jeder Antwort
+    ohne Neusortierung angezeigt werden. Die Schnittstelle (len, row, position, ki_ratio) passt zu
+    LeaderboardTable, sodass VirtualLeaderboard direkt darauf anzeigen kann.
+    """
+
+    def __init__(self, rows=()):
+        self.end = _Node(END_KEY, 0)
+        self.head = _Node(None, MAX_LEVELS)
+        self.head.next = [self.end] * MAX_LEVELS
+        self.size = 0
+        # Name -> (Richtig, Falsch) bzw. aktueller Schlüssel
+        self.scores = {}
+        self.keys = {}
+        for name, richtig, falsch in rows:
+            self.scores[name] = (richtig, falsch)
+        for name, (richtig, falsch) in self.scores.items():
+            self.keys[name] = sort_key(name, richtig, falsch)
+        self.build(sorted(self.keys.values()))
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, name):
+        return name in self.scores
+
+    # ===============================
+    # Skipliste
+    # ===============================
+
+    @staticmethod
+    def random_levels():
+        return min(MAX_LEVELS, 1 - int(math.log(1.0 - random.random(), 2.0)))
+
+    def build(self, keys):
+        """Baut die leere Liste aus sortierten Schlüsseln in einem Durchlauf auf (O(n) statt O(n log n)).
+
+        Die Ebenen werden nicht gewürfelt, sondern gleichmäßig verteilt (Position p bekommt eine
+        Ebene mehr als p Nullbits am Ende hat). Pro Ebene wird der zuletzt verkettete Knoten und
+        seine Position gemerkt; die Breite eines Verweises ist der Positionsabstand zum nächsten
+        Knoten derselben Ebene.
+        """
+        last = [self.head] * MAX_LEVELS
+        last_position = [0] * MAX_LEVELS
+        position = 0
+        for position, key in enumerate(keys, 1):
+            levels = min(MAX_LEVELS, (position & -position).bit_length())
+            node = _Node(key, levels)
+            for level in range(levels):
+                last[level].next[level] = node
+                last[level].width[level] = position - last_position[level]
+                last[level] = node
+                last_position[level] = position
+        for level in range(MAX_LEVELS):
+            last[level].next[level] = self.end
+            last[level].width[level] = position + 1 - last_position[level]
+        self.size = position
+
+    def insert_key(self, key):
+        chain = [None] * MAX_LEVELS
+        steps_at_level = [0] * MAX_LEVELS
+        node = self.head
+        for level in reversed(range(MAX_LEVELS)):
+            while node.next[level].key <= key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        levels = self.random_levels()
+        new_node = _Node(key, levels)
+        steps = 0
+        for level in range(levels):
+            prev_node = chain[level]
+            new_node.next[level] = prev_node.next[level]
+            prev_node.next[level] = new_node
+            new_node.width[level] = prev_node.width[level] - steps
+            prev_node.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, MAX_LEVELS):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove_key(self, key):
+        chain = [None] * MAX_LEVELS
+        node = self.head
+        for level in reversed(range(MAX_LEVELS)):
+            while node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+        target = chain[0].next[0]
+        if target.key != key:
+            raise KeyError(key)
+        levels = len(target.next)
+        for level in range(levels):
+            prev_node = chain[level]
+            prev_node.width[level] += target.width[level] - 1
+            prev_node.next[level] = target.next[level]
+        for level in range(levels, MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+    def index_of_key(self, key):
+        """Anzahl der Schlüssel, die vor key einsortiert sind."""
+        index = 0
+        node = self.head
+        for level in reversed(range(MAX_LEVELS)):
+            while node.next[level].key < key:
+                index += node.width[level]
+                node = node.next[level]
+        return index
+
+    def node_at(self, i):
+        """Gibt den Knoten an Position i (0-basiert) zurück."""
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+        node = self.head
+        i += 1
+        for level in reversed(range(MAX_LEVELS)):
+            while node.width[level] <= i:
+                i -= node.width[level]
+                node = node.next[level]
+        return node
+
+    # ===============================
+    # Nutzer
+    # ===============================
+
+    def update(self, name, richtig, falsch):
+        """Setzt die Gesamtwerte eines Nutzers und sortiert ihn neu ein."""
+        old_key = self.keys.get(name)
+        if old_key is not None:
+            self.remove_key(old_key)
+        key = sort_key(name, richtig, falsch)
+        self.insert_key(key)
+        self.keys[name] = key
+        self.scores[name] = (richtig, falsch)
+
+    def get(self, name):
+        """Gibt (Richtig, Falsch) eines Nutzers zurück oder None."""
+        return self.scores.get(name)
+
+    def rank(self, name):
+        """1-basierter Rang eines Nutzers oder None."""
+        key = self.keys.get(name)
+        if key is None:
+            return None
+        return self.index_of_key(key) + 1
+
+    def ratio(self, name):
+        """Quote eines Nutzers (0 ohne Antworten) oder None."""
+        key = self.keys.get(name)
+        return -key[0] if key is not None else None
+
+    def top(self, k):
+        """Die ersten k Einträge als Liste von (Name, Richtig, Falsch)."""
+        return self.slice(0, k)
+
+    def slice(self, start, stop):
+        """Einträge start bis stop (exklusiv) in Rangfolge."""
+        stop = min(stop, self.size)
+        if start >= stop:
+            return []
+        result = []
+        node = self.node_at(start)
+        for _ in range(stop - start):
+            name = node.key[2]
+            result.append((name,) + self.scores[name])
+            node = node.next[0]
+        return result
+
+    # ===============================
+    # Schnittstelle für VirtualLeaderboard
+    # ===============================
+
+    @property
+    def ki_ratio(self):
+        ratio = self.ratio(KI_NAME)
+        return ratio if ratio is not None else 0.8
+
+    def position(self, name):
+        rank = self.rank(name)
+        return rank - 1 if rank is not None else None
+
+    def row(self, i):
+        key = self.node_at(i).key
+        name = key[2]
+        richtig, falsch = self.scores[name]
+        anzahl = richtig + falsch
+        return (name, richtig, falsch, anzahl, f"{round(-key[0] * 100)}%", -key[0])
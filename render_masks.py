@@ -0,0 +1,86 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from mask_pipeline import size_dirname, parse_size
+
+# Rendert alle Masken aus MaskeRAVDESS vorab in den Größen der Kiosk-Bildschirme,
+# damit emotion_selected die Maske ohne LANCZOS-Skalierung anzeigen kann.
+# Aufruf z.B.: python render_masks.py --sizes 800x430,1280x790,1920x1030
+
+DEFAULT_SIZES = "800x430,1280x790,1920x1030"
+
+
+def render_mask(source_path, targets):
+    """Skaliert eine Maske auf alle Zielgrößen. targets ist eine Liste aus ((Breite, Höhe), Zielpfad)."""
+    image = Image.open(source_path)
+    image.load()
+    for size, target_path in targets:
+        resized = image.resize(size, Image.Resampling.LANCZOS)
+        tmp_path = target_path + ".tmp"
+        resized.save(tmp_path, format="PNG")
+        os.replace(tmp_path, target_path)
+    return len(targets)
+
+
+def is_up_to_date(source_mtime, target_path):
+    """Eine Zieldatei ist aktuell, wenn sie existiert und nicht älter als die Quelle ist."""
+    try:
+        return os.stat(target_path).st_mtime_ns >= source_mtime
+    except OSError:
+        return False
+
+
+def collect_jobs(mask_folder, output_folder, sizes, mask_ext):
+    """Sammelt pro Maske die Größen, die (neu) gerendert werden müssen."""
+    for size in sizes:
+        os.makedirs(os.path.join(output_folder, size_dirname(size)), exist_ok=True)
+
+    jobs = []
+    skipped = 0
+    with os.scandir(mask_folder) as entries:
+        for entry in entries:
+            if not entry.is_file() or not entry.name.lower().endswith(mask_ext):
+                continue
+            source_mtime = entry.stat().st_mtime_ns
+            targets = []
+            for size in sizes:
+                target_path = os.path.join(output_folder, size_dirname(size), entry.name)
+                if is_up_to_date(source_mtime, target_path):
+                    skipped += 1
+                else:
+                    targets.append((size, target_path))
+            if targets:
+                jobs.append((entry.path, targets))
+    return jobs, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Masken vorab in mehreren Auflösungen rendern.")
+    parser.add_argument("--mask-folder", default=os.path.join("Daten", "MaskeRAVDESS"))
+    parser.add_argument("--output-folder", default=os.path.join("Daten", "MaskeRAVDESS_sizes"))
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Kommagetrennte Liste, z.B. 800x430,1920x1030")
+    parser.add_argument("--mask-ext", default=".png")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse (Standard: alle Kerne)")
+    args = parser.parse_args()
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    jobs, skipped = collect_jobs(args.mask_folder, args.output_folder, sizes, args.mask_ext)
+    print(f"{len(jobs)} Masken zu rendern, {skipped} Dateien bereits aktuell")
+
+    rendered = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(render_mask, source, targets) for source, targets in jobs]
+        for (source, _), future in zip(jobs, futures):
+            try:
+                rendered += future.result()
+            except Exception as e:
+                print("Fehler beim Rendern von", source, e)
+
+    print(f"{rendered} Dateien geschrieben nach {args.output_folder}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+# Füllt die Spalte "Model" in Data_Lables.csv mit echten Modellvorhersagen.
+#
+# Pro Clip werden einige Frames gesampelt und in Batches an einen Predictor übergeben, verteilt
+# auf mehrere Prozesse. Ergebnisse werden nach Inhalts-Hash der Datei (und Predictor-Version)
+# gecacht, sodass erneute Läufe nur neue oder geänderte Clips bewerten.
+#
+# Aufruf z.B.: python score_clips.py --predictor mein_modell:EmotionPredictor
+#              python score_clips.py --benchmark 2000   (Dummy-Predictor, synthetische Frames)
+
+EMOTIONS = ["Neutral", "Freude", "Trauer", "Wut", "Angst", "Ekel", "Überraschung"]
+
+folder_path = os.path.join("Daten", "RAVDESS")
+labels_csv = os.path.join("Daten", "Data_Lables.csv")
+cache_path = os.path.join("Daten", "Model_Cache.json")
+
+
+class Predictor:
+    """Schnittstelle für Modelle. Unterklassen setzen version und implementieren predict_batch."""
+
+    version = "unbekannt"
+
+    def predict_batch(self, frames):
+        """frames hat die Form (Clips, Frames, Höhe, Breite, 3) als uint8.
+        Rückgabe: Wahrscheinlichkeiten der Form (Clips, len(EMOTIONS))."""
+        raise NotImplementedError
+
+
+class DummyPredictor(Predictor):
+    """Deterministischer CPU-Predictor ohne Training (für Tests und Benchmarks).
+
+    Eine feste Zufallsprojektion über verkleinerte Frames liefert für denselben Inhalt immer
+    dieselbe Vorhersage.
+    """
+
+    version = "dummy-1"
+
+    def __init__(self, grid=16, seed=0):
+        self.grid = grid
+        self.weights = np.random.default_rng(seed).standard_normal((grid * grid * 3, len(EMOTIONS))).astype(np.float32)
+
+    def predict_batch(self, frames):
+        clips, count, height, width, channels = frames.shape
+        gy, gx = height // self.grid, width // self.grid
+        cropped = frames[:, :, :gy * self.grid, :gx * self.grid, :].astype(np.float32) / 255.0
+        pooled = cropped.reshape(clips, count, self.grid, gy, self.grid, gx, channels).mean(axis=(1, 3, 5))
+        logits = pooled.reshape(clips, -1) @ self.weights
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+
+def load_predictor(spec):
+    """Erzeugt einen Predictor aus "dummy" oder "modul:Klasse"."""
+    if spec == "dummy":
+        return DummyPredictor()
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+# ===============================
+# Frames
+# ===============================
+
+def sample_frames(path, count, size):
+    """Liest count gleichmäßig verteilte Frames eines Videos (benötigt opencv-python)."""
+    try:
+        import cv2
+    except ImportError:
+        raise ImportError("Zum Lesen von Videos wird opencv-python benötigt: pip install opencv-python")
+
+    capture = cv2.VideoCapture(path)
+    try:
+        total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total <= 0:
+            raise ValueError(f"Keine Frames gefunden: {path}")
+        frames = []
+        for index in np.linspace(0, total - 1, count).astype(int):
+            capture.set(cv2.CAP_PROP_POS_FRAMES, int(index))
+            ok, frame = capture.read()
+            if not ok:
+                raise ValueError(f"Frame {index} nicht lesbar: {path}")
+            frame = cv2.cvtColor(cv2.resize(frame, size), cv2.COLOR_BGR2RGB)
+            frames.append(frame)
+        return np.stack(frames)
+    finally:
+        capture.release()
+
+
+def synthetic_frames(name, count, size):
+    """Erzeugt reproduzierbare Frames aus dem Clipnamen (für Benchmarks ohne Videos)."""
+    seed = int.from_bytes(hashlib.sha1(name.encode("utf-8")).digest()[:8], "little")
+    return np.random.default_rng(seed).integers(0, 256, (count, size[1], size[0], 3), dtype=np.uint8)
+
+
+# ===============================
+# Worker
+# ===============================
+
+_worker_predictor = None
+
+
+def init_worker(spec):
+    global _worker_predictor
+    _worker_predictor = load_predictor(spec)
+
+
+def score_batch(jobs, frame_count, size, synthetic):
+    """Bewertet einen Batch [(Schlüssel, Pfad)] und gibt [(Schlüssel, Emotion)] zurück."""
+    frames, keys = [], []
+    for key, path in jobs:
+        try:
+            if synthetic:
+                frames.append(synthetic_frames(path, frame_count, size))
+            else:
+                frames.append(sample_frames(path, frame_count, size))
+            keys.append(key)
+        except Exception as e:
+            print("Fehler beim Lesen von", path, e)
+    if not frames:
+        return []
+    probabilities = _worker_predictor.predict_batch(np.stack(frames))
+    return [(key, EMOTIONS[int(i)]) for key, i in zip(keys, probabilities.argmax(axis=1))]
+
+
+def run_scoring(jobs, spec, batch_size, workers, frame_count, size, synthetic, results=None, checkpoint=None,
+                checkpoint_every=20):
+    """Verteilt die Jobs in Batches auf einen Prozesspool und sammelt die Ergebnisse in results.
+
+    Ein fehlgeschlagener Batch wird gemeldet und übersprungen (beim nächsten Lauf erneut bewertet);
+    checkpoint() wird alle checkpoint_every fertigen Batches aufgerufen, um den Stand zu sichern.
+    """
+    batches = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+    results = {} if results is None else results
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(spec,)) as executor:
+        futures = {executor.submit(score_batch, batch, frame_count, size, synthetic): batch for batch in batches}
+        done = 0
+        for future in as_completed(futures):
+            try:
+                results.update(future.result())
+            except Exception as e:
+                batch = futures[future]
+                print(f"Fehler bei Batch mit {len(batch)} Clips ab {batch[0][1]}:", e)
+                continue
+            done += 1
+            if checkpoint is not None and done % checkpoint_every == 0:
+                checkpoint()
+    return results
+
+
+# ===============================
+# Cache
+# ===============================
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_cache(path):
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except ValueError as e:
+            print("Cache nicht lesbar, starte neu:", e)
+    return {"files": {}, "results": {}}
+
+
+def save_cache(cache, path):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+
+def content_hashes(folder, names, cache, threads=8):
+    """Inhalts-Hash je Clip; Größe und mtime aus dem Cache ersparen das erneute Lesen."""
+    files = cache["files"]
+    hashes, todo = {}, []
+    for name in names:
+        path = os.path.join(folder, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            print("Video nicht gefunden:", path)
+            continue
+        known = files.get(name)
+        if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+            hashes[name] = known[2]
+        else:
+            todo.append((name, path, st))
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for (name, path, st), digest in zip(todo, executor.map(file_hash, [t[1] for t in todo])):
+            files[name] = [st.st_size, st.st_mtime_ns, digest]
+            hashes[name] = digest
+    return hashes
+
+
+# ===============================
+# Einstiegspunkte
+# ===============================
+
+def score_labels(args):
+    labels = pd.read_csv(args.labels)
+    cache = load_cache(args.cache)
+    version = load_predictor(args.predictor).version
+    results = cache["results"].setdefault(version, {})
+
+    hashes = content_hashes(args.folder, labels["Name"].tolist(), cache)
+    jobs = sorted({(digest, os.path.join(args.folder, name)) for name, digest in hashes.items() if digest not in results})
+    print(f"{len(labels)} Clips, {len(jobs)} ohne gecachtes Ergebnis für Predictor {version}")
+
+    if jobs:
+        start = time.perf_counter()
+        scored = len(results)
+        run_scoring(jobs, args.predictor, args.batch_size, args.workers, args.frames, args.size, False,
+                    results=results, checkpoint=lambda: save_cache(cache, args.cache))
+        scored = len(results) - scored
+        elapsed = time.perf_counter() - start
+        print(f"{scored} von {len(jobs)} Clips in {elapsed:.1f}s bewertet ({scored / elapsed:.1f} Clips/s)")
+        save_cache(cache, args.cache)
+
+    labels["Model"] = [results.get(hashes.get(name), model) for name, model in zip(labels["Name"], labels["Model"])]
+    tmp_path = args.labels + ".tmp"
+    labels.to_csv(tmp_path, index=False, header=True)
+    os.replace(tmp_path, args.labels)
+
+
+def benchmark(args):
+    names = [f"synthetisch-{i:06d}" for i in range(args.benchmark)]
+    jobs = [(name, name) for name in names]
+    start = time.perf_counter()
+    results = run_scoring(jobs, args.predictor, args.batch_size, args.workers, args.frames, args.size, True)
+    elapsed = time.perf_counter() - start
+    print(f"{len(results)} synthetische Clips in {elapsed:.2f}s: {len(results) / elapsed:.1f} Clips/s "
+          f"(Batch {args.batch_size}, {args.frames} Frames à {args.size[0]}x{args.size[1]})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modellvorhersagen für Data_Lables.csv berechnen.")
+    parser.add_argument("--folder", default=folder_path)
+    parser.add_argument("--labels", default=labels_csv)
+    parser.add_argument("--cache", default=cache_path)
+    parser.add_argument("--predictor", default="dummy", help='"dummy" oder "modul:Klasse"')
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--frames", type=int, default=8, help="Gesampelte Frames pro Clip")
+    parser.add_argument("--size", default="112x112", help="Framegröße für den Predictor")
+    parser.add_argument("--benchmark", type=int, default=0, metavar="N", help="N synthetische Clips bewerten und Durchsatz ausgeben")
+    args = parser.parse_args()
+    args.size = tuple(int(v) for v in args.size.lower().split("x"))
+
+    if args.benchmark:
+        benchmark(args)
+    else:
+        score_labels(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import threading
+import time
+import traceback
+
+APP_FOLDER = os.path.dirname(os.path.abspath(__file__))
+
+
+class StallWatchdog:
+    """Misst die Verzögerung der Tk-Event-Loop und meldet Hänger mit der verursachenden Stelle.
+
+    Ein Herzschlag per root.after sollte alle interval_ms laufen; kommt er mehr als threshold_ms
+    zu spät, war die Loop blockiert. Ein Überwachungsthread schaut währenddessen in den Stack des
+    Tk-Threads und merkt sich, welche Funktion der App gerade läuft, damit die Meldung nach dem
+    Hänger die Ursache nennen kann. Dauert ein Hänger länger als hang_ms, wird sofort gemeldet.
+    """
+
+    def __init__(self, root, threshold_ms=150, interval_ms=50, hang_ms=5000):
+        self.root = root
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.hang = hang_ms / 1000
+        self.tk_thread = threading.get_ident()
+
+        self.last_beat = time.perf_counter()
+        self.stall_site = None
+        self.hang_reported = False
+        self.stalls = 0
+        self.max_lag = 0.0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.last_beat = time.perf_counter()
+        self.root.after(int(self.interval * 1000), self.beat)
+        self.thread = threading.Thread(target=self.watch, name="stall-watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def beat(self):
+        """Herzschlag im Tk-Thread: Verspätung gegenüber dem geplanten Zeitpunkt messen."""
+        now = time.perf_counter()
+        lag = now - self.last_beat - self.interval
+        self.max_lag = max(self.max_lag, lag)
+        if lag > self.threshold:
+            self.stalls += 1
+            print(f"Event-Loop blockiert für {lag * 1000:.0f} ms in {self.stall_site or 'unbekannt'}")
+        self.stall_site = None
+        self.hang_reported = False
+        self.last_beat = now
+        if not self.stop_event.is_set():
+            self.root.after(int(self.interval * 1000), self.beat)
+
+    def watch(self):
+        """Überwachungsthread: hält die laufende Stelle fest, solange der Herzschlag ausbleibt."""
+        while not self.stop_event.wait(self.interval / 2):
+            age = time.perf_counter() - self.last_beat - self.interval
+            if age <= self.threshold:
+                continue
+            frame = sys._current_frames().get(self.tk_thread)
+            if frame is not None and self.stall_site is None:
+                self.stall_site = self.describe(frame)
+            if age > self.hang and not self.hang_reported:
+                self.hang_reported = True
+                print(f"Event-Loop hängt seit {age:.1f} s in {self.stall_site or 'unbekannt'}")
+
+    @staticmethod
+    def describe(frame):
+        """Die innersten Aufrufe aus Dateien der App, z.B. "main.py:123 emotion_selected"."""
+        stack = traceback.extract_stack(frame)
+        own = [entry for entry in stack if entry.filename.startswith(APP_FOLDER)]
+        entries = (own or stack)[-3:]
+        return " <- ".join(f"{os.path.basename(e.filename)}:{e.lineno} {e.name}" for e in reversed(entries))
+
+    def stats(self):
+        return {"stalls": self.stalls, "max_lag_ms": self.max_lag * 1000}
@@ -0,0 +1,45 @@
+import os
+import threading
+import time
+
+
+class StartupTimer:
+    """Misst die Startphasen relativ zum Prozessstart und protokolliert sie.
+
+    Die wichtigste Kennzahl ist "interactive": Zeit vom Start bis zum ersten Frame, in dem das
+    Fenster gezeichnet ist und Eingaben annimmt. Jeder Start wird als Zeile an eine CSV-Datei
+    angehängt, damit sich Kaltstarts über mehrere Kiosk-Neustarts vergleichen lassen.
+    """
+
+    def __init__(self, start=None, log_file=None):
+        self.start = start if start is not None else time.perf_counter()
+        self.log_file = log_file
+        self.marks = {}
+        self.lock = threading.Lock()
+        self.reported = False
+
+    def mark(self, name):
+        """Merkt die Zeit seit dem Start für eine Phase (auch aus Hintergrund-Threads)."""
+        with self.lock:
+            self.marks.setdefault(name, time.perf_counter() - self.start)
+
+    def report(self):
+        """Gibt die Aufschlüsselung einmalig aus und hängt sie an die Log-Datei an."""
+        with self.lock:
+            if self.reported:
+                return
+            self.reported = True
+            marks = sorted(self.marks.items(), key=lambda item: item[1])
+        print("Startzeiten: " + " | ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in marks))
+        if not self.log_file:
+            return
+        try:
+            new_file = not os.path.exists(self.log_file)
+            with open(self.log_file, "a", encoding="utf-8") as f:
+                if new_file:
+                    f.write("Zeitpunkt,Phase,Millisekunden\n")
+                stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+                for name, seconds in marks:
+                    f.write(f"{stamp},{name},{seconds * 1000:.1f}\n")
+        except OSError as e:
+            print("Fehler beim Schreiben der Startzeiten:", e)
@@ -0,0 +1,85 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TaskRunner:
+    """Gemeinsamer Executor für blockierende Arbeit (Dateizugriffe), damit der Tk-Thread frei bleibt.
+
+    submit() führt eine Funktion in einem Worker-Thread aus, watch() beobachtet einen bereits
+    laufenden Future. Die Callbacks laufen immer im Tk-Thread: fertige Futures landen in einer
+    Queue, die per root.after abgefragt wird, solange etwas aussteht. debounce() fasst wiederholte
+    Aufträge mit demselben Schlüssel zu einem einzigen zusammen, der erst nach einer Ruhepause läuft.
+    """
+
+    def __init__(self, root, workers=2, poll_ms=15):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="io")
+        self.finished = queue.SimpleQueue()
+        self.outstanding = 0
+        self.polling = False
+        # Schlüssel -> (after-ID, Name, Funktion, Argumente)
+        self.debounced = {}
+
+    def submit(self, name, fn, *args, on_done=None, on_error=None):
+        """Führt fn(*args) im Hintergrund aus; on_done(Ergebnis) bzw. on_error(Fehler) im Tk-Thread."""
+        def callback(future):
+            try:
+                result = future.result()
+            except Exception as e:
+                if on_error is not None:
+                    on_error(e)
+                else:
+                    print(f"Fehler bei {name}:", e)
+                return
+            if on_done is not None:
+                on_done(result)
+        return self.watch(self.executor.submit(fn, *args), callback)
+
+    def watch(self, future, callback):
+        """Ruft callback(future) im Tk-Thread auf, sobald der Future fertig ist."""
+        self.outstanding += 1
+        future.add_done_callback(lambda f: self.finished.put((f, callback)))
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.poll_ms, self.poll)
+        return future
+
+    def poll(self):
+        """Liefert fertige Ergebnisse im Tk-Thread aus."""
+        while True:
+            try:
+                future, callback = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            self.outstanding -= 1
+            callback(future)
+        if self.outstanding > 0:
+            self.root.after(self.poll_ms, self.poll)
+        else:
+            self.polling = False
+
+    def debounce(self, key, delay_ms, name, fn, *args):
+        """Plant fn(*args) nach delay_ms; ein erneuter Aufruf mit demselben Schlüssel verschiebt ihn."""
+        pending = self.debounced.pop(key, None)
+        if pending is not None:
+            self.root.after_cancel(pending[0])
+        after_id = self.root.after(delay_ms, self.fire, key)
+        self.debounced[key] = (after_id, name, fn, args)
+
+    def fire(self, key):
+        pending = self.debounced.pop(key, None)
+        if pending is not None:
+            _, name, fn, args = pending
+            self.submit(name, fn, *args)
+
+    def flush(self):
+        """Startet alle verzögerten Aufträge sofort (z.B. beim Beenden)."""
+        for key in list(self.debounced):
+            self.root.after_cancel(self.debounced[key][0])
+            self.fire(key)
+
+    def shutdown(self):
+        """Führt verzögerte Aufträge aus und wartet auf alle laufenden."""
+        self.flush()
+        self.executor.shutdown(wait=True)
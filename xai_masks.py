@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from PIL import Image
+
+import score_clips
+
+# Erzeugt die XAI-Masken in Daten/MaskeRAVDESS aus dem Modell (Occlusion-Saliency).
+#
+# Für jeden Clip werden Frames gesampelt und quadratische Bereiche aller Frames abgedeckt; wie stark
+# die Wahrscheinlichkeit der vorhergesagten Emotion dabei fällt, ergibt die Wichtigkeit des
+# Bereichs. Alle abgedeckten Varianten eines Clips werden als ein NumPy-Batch ausgewertet, Clips
+# laufen parallel auf mehreren Prozessen. Masken werden einzeln geschrieben, sobald sie fertig
+# sind; Clips mit unveränderter Quelle und Modellversion werden übersprungen. Zusätzlich wird die
+# reine Saliency-Karte als Graustufenbild in Daten/SaliencyRAVDESS abgelegt; die App kann sie damit
+# in voller Fenstergröße über ein Standbild legen (Konfiguration "mask_overlay" in main.py).
+#
+# Aufruf z.B.: python xai_masks.py --predictor mein_modell:EmotionPredictor
+#              python xai_masks.py --benchmark 50   (Dummy-Predictor, synthetische Frames)
+
+folder_path = os.path.join("Daten", "RAVDESS")
+mask_folder = os.path.join("Daten", "MaskeRAVDESS")
+saliency_folder = os.path.join("Daten", "SaliencyRAVDESS")
+
+
+def occlusion_masks(height, width, patch, stride):
+    """Boolesche Masken (Positionen, Höhe, Breite) für alle Patch-Positionen, vektorisiert erzeugt."""
+    starts_y = np.arange(0, max(height - patch, 0) + 1, stride)
+    starts_x = np.arange(0, max(width - patch, 0) + 1, stride)
+    y = np.arange(height)
+    x = np.arange(width)
+    rows = (y[None, :] >= starts_y[:, None]) & (y[None, :] < starts_y[:, None] + patch)
+    cols = (x[None, :] >= starts_x[:, None]) & (x[None, :] < starts_x[:, None] + patch)
+    return (rows[:, None, :, None] & cols[None, :, None, :]).reshape(-1, height, width)
+
+
+def saliency_map(predictor, frames, patch, stride, batch_size):
+    """Occlusion-Saliency eines Clips. frames hat die Form (Frames, Höhe, Breite, 3)."""
+    count, height, width, _ = frames.shape
+    base = predictor.predict_batch(frames[None])[0]
+    target = int(base.argmax())
+    fill = frames.mean(axis=(0, 1, 2)).astype(frames.dtype)
+
+    masks = occlusion_masks(height, width, patch, stride)
+    drops = np.empty(len(masks), dtype=np.float32)
+    for start in range(0, len(masks), batch_size):
+        chunk = masks[start:start + batch_size]
+        # (Positionen, Frames, Höhe, Breite, 3): jede Variante deckt denselben Bereich in allen Frames ab
+        occluded = np.where(chunk[:, None, :, :, None], fill, frames[None])
+        drops[start:start + len(chunk)] = base[target] - predictor.predict_batch(occluded)[:, target]
+
+    coverage = masks.sum(axis=0, dtype=np.float32)
+    saliency = np.tensordot(np.clip(drops, 0, None), masks.astype(np.float32), axes=1)
+    saliency = np.divide(saliency, coverage, out=np.zeros_like(saliency), where=coverage > 0)
+    peak = saliency.max()
+    return saliency / peak if peak > 0 else saliency, target
+
+
+def render_mask(frame, saliency, alpha=0.6):
+    """Legt die Saliency als Rotton über den mittleren Frame."""
+    heat = np.zeros_like(frame, dtype=np.float32)
+    heat[..., 0] = 255.0
+    weight = (saliency * alpha)[..., None]
+    blended = frame.astype(np.float32) * (1.0 - weight) + heat * weight
+    return Image.fromarray(blended.astype(np.uint8))
+
+
+def save_image(image, output_path):
+    tmp_path = output_path + ".tmp"
+    image.save(tmp_path, format="PNG")
+    os.replace(tmp_path, output_path)
+
+
+def process_clip(name, path, output_path, args):
+    """Berechnet und schreibt die Maske (und ggf. die Saliency-Karte) eines Clips (läuft im Worker)."""
+    predictor = score_clips._worker_predictor
+    if args["synthetic"]:
+        frames = score_clips.synthetic_frames(name, args["frames"], args["size"])
+    else:
+        frames = score_clips.sample_frames(path, args["frames"], args["size"])
+    saliency, target = saliency_map(predictor, frames, args["patch"], args["stride"], args["batch_size"])
+    save_image(render_mask(frames[len(frames) // 2], saliency), output_path)
+    if args["saliency_output"]:
+        saliency_path = os.path.join(args["saliency_output"], os.path.basename(output_path))
+        save_image(Image.fromarray((saliency * 255).astype(np.uint8)), saliency_path)
+    return name, score_clips.EMOTIONS[target]
+
+
+def load_manifest(path):
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except ValueError as e:
+            print("Manifest nicht lesbar, erzeuge alle Masken neu:", e)
+    return {}
+
+
+def save_manifest(manifest, path):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+def generate(clips, output_folder, args, manifest=None, manifest_path=None):
+    """Erzeugt Masken für [(Name, Pfad, Fingerabdruck)] und aktualisiert das Manifest laufend."""
+    os.makedirs(output_folder, exist_ok=True)
+    if args["saliency_output"]:
+        os.makedirs(args["saliency_output"], exist_ok=True)
+    done = 0
+    with ProcessPoolExecutor(max_workers=args["workers"], initializer=score_clips.init_worker,
+                             initargs=(args["predictor"],)) as executor:
+        futures = {}
+        for name, path, fingerprint in clips:
+            output_path = os.path.join(output_folder, os.path.splitext(name)[0] + ".png")
+            futures[executor.submit(process_clip, name, path, output_path, args)] = (name, fingerprint)
+        for future in as_completed(futures):
+            name, fingerprint = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                print("Fehler bei", name, e)
+                continue
+            done += 1
+            if manifest is not None:
+                manifest[name] = fingerprint
+                if done % 50 == 0:
+                    save_manifest(manifest, manifest_path)
+    if manifest is not None:
+        save_manifest(manifest, manifest_path)
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Occlusion-Saliency-Masken für alle Clips erzeugen.")
+    parser.add_argument("--folder", default=folder_path)
+    parser.add_argument("--output", default=mask_folder)
+    parser.add_argument("--saliency-output", default=saliency_folder,
+                        help='Ordner für die Saliency-Karten als Graustufenbild ("" schaltet sie ab)')
+    parser.add_argument("--predictor", default="dummy", help='"dummy" oder "modul:Klasse" (siehe score_clips.Predictor)')
+    parser.add_argument("--frames", type=int, default=4, help="Gesampelte Frames pro Clip")
+    parser.add_argument("--size", default="224x224", help="Framegröße für Modell und Maske")
+    parser.add_argument("--patch", type=int, default=32)
+    parser.add_argument("--stride", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=32, help="Abgedeckte Varianten pro Modellaufruf")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--benchmark", type=int, default=0, metavar="N", help="N synthetische Clips bewerten und Durchsatz ausgeben")
+    parsed = parser.parse_args()
+
+    args = {
+        "predictor": parsed.predictor,
+        "frames": parsed.frames,
+        "size": tuple(int(v) for v in parsed.size.lower().split("x")),
+        "patch": parsed.patch,
+        "stride": parsed.stride,
+        "batch_size": parsed.batch_size,
+        "workers": parsed.workers,
+        "synthetic": bool(parsed.benchmark),
+        "saliency_output": parsed.saliency_output,
+    }
+
+    if parsed.benchmark:
+        clips = [(f"synthetisch-{i:06d}.mp4", None, None) for i in range(parsed.benchmark)]
+        with tempfile.TemporaryDirectory() as output_folder:
+            if args["saliency_output"]:
+                args["saliency_output"] = os.path.join(output_folder, "saliency")
+            start = time.perf_counter()
+            done = generate(clips, output_folder, args)
+            elapsed = time.perf_counter() - start
+        positions = len(occlusion_masks(args["size"][1], args["size"][0], args["patch"], args["stride"]))
+        print(f"{done} synthetische Clips in {elapsed:.2f}s: {done / elapsed:.2f} Clips/s "
+              f"({positions} Occlusion-Positionen à {args['frames']} Frames pro Clip)")
+        return
+
+    # Fingerabdruck: Quelle (Größe, mtime), Modellversion und Parameter
+    version = score_clips.load_predictor(parsed.predictor).version
+    params = [args["frames"], list(args["size"]), args["patch"], args["stride"]]
+    manifest_path = os.path.join(parsed.output, "xai_manifest.json")
+    manifest = load_manifest(manifest_path)
+
+    clips, skipped = [], 0
+    with os.scandir(parsed.folder) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".mp4") or not entry.is_file():
+                continue
+            st = entry.stat()
+            fingerprint = [st.st_size, st.st_mtime_ns, version, params]
+            mask_name = os.path.splitext(entry.name)[0] + ".png"
+            outputs = [os.path.join(parsed.output, mask_name)]
+            if parsed.saliency_output:
+                outputs.append(os.path.join(parsed.saliency_output, mask_name))
+            if manifest.get(entry.name) == fingerprint and all(os.path.exists(p) for p in outputs):
+                skipped += 1
+            else:
+                clips.append((entry.name, entry.path, fingerprint))
+
+    print(f"{len(clips)} Masken zu erzeugen, {skipped} aktuell (Predictor {version})")
+    if clips:
+        start = time.perf_counter()
+        done = generate(clips, parsed.output, args, manifest, manifest_path)
+        elapsed = time.perf_counter() - start
+        print(f"{done} Masken in {elapsed:.1f}s erzeugt ({done / elapsed:.2f} Clips/s)")
+
+
+if __name__ == "__main__":
+    main()